@@ -7,7 +7,7 @@
 
 from pathlib import Path
 
-from aospdtgen.proprietary_files.section import register_sections
+from aospdtgen.proprietary_files.registry import load_sections
 
 __version__ = "1.1.1"
 
@@ -15,4 +15,4 @@ module_path = Path(__file__).parent
 sections_path = module_path / "proprietary_files" / "sections"
 current_path = Path.cwd()
 
-register_sections(sections_path)
+load_sections(sections_path)
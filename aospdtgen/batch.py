@@ -0,0 +1,145 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from pathlib import Path
+from sebaubuntu_libs.libexception import format_exception
+from sebaubuntu_libs.liblogging import LOGE, LOGI, LOGW
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from aospdtgen.device_tree import DeviceTree
+from aospdtgen.proprietary_files.elf_cache import ELFCache
+
+class BatchEntry:
+	"""A dump to generate a device tree from, and the folder to put it in."""
+	def __init__(self, dump_path: Path, output_path: Path):
+		"""Initialize a batch entry."""
+		self.dump_path = dump_path
+		self.output_path = output_path
+
+class BatchResult:
+	"""Outcome of generating the device tree of a batch entry."""
+	def __init__(self, entry: BatchEntry, time: float, error: Optional[str] = None):
+		"""Initialize a batch result, error is the formatted exception if it failed."""
+		self.entry = entry
+		self.time = time
+		self.error = error
+
+	@property
+	def success(self) -> bool:
+		return self.error is None
+
+def get_entries(dump_paths: List[Path], output_path: Path) -> List[BatchEntry]:
+	"""Put the device tree of each dump in a folder of output_path named after the dump."""
+	entries: List[BatchEntry] = []
+	names: Dict[str, int] = {}
+
+	for dump_path in dump_paths:
+		name = dump_path.resolve().name
+
+		# Don't let dumps with the same folder name overwrite each other
+		count = names.get(name, 0)
+		names[name] = count + 1
+		if count:
+			name = f"{name}_{count}"
+
+		entries.append(BatchEntry(dump_path, output_path / name))
+
+	return entries
+
+def get_entries_from_manifest(manifest: Path, output_path: Path) -> List[BatchEntry]:
+	"""
+	Read a manifest listing one dump per line, optionally followed by its output folder.
+
+	Empty lines and lines starting with # are ignored, relative paths are relative
+	to the manifest's folder (dumps) and output_path (output folders).
+	"""
+	entries: List[BatchEntry] = []
+	dump_paths: List[Path] = []
+
+	for line in manifest.read_text().splitlines():
+		line = line.strip()
+		if not line or line.startswith("#"):
+			continue
+
+		dump_path, *output = line.split(maxsplit=1)
+		if output:
+			entries.append(BatchEntry(manifest.parent / dump_path, output_path / output[0]))
+		else:
+			dump_paths.append(manifest.parent / dump_path)
+
+	return entries + get_entries(dump_paths, output_path)
+
+def run_entry(
+	entry: BatchEntry,
+	elf_cache: Optional[ELFCache] = None,
+	jobs: int = 1,
+	hardlink: bool = False,
+	incremental: bool = False,
+) -> BatchResult:
+	"""Generate the device tree of a batch entry, catching any error."""
+	LOGI(f"Generating device tree of {entry.dump_path}")
+	start = perf_counter()
+
+	try:
+		dump = DeviceTree(entry.dump_path, elf_cache=elf_cache, jobs=jobs)
+		try:
+			dump.dump_to_folder(entry.output_path, hardlink=hardlink, incremental=incremental)
+		finally:
+			dump.cleanup()
+	except Exception as e:
+		LOGE(f"Failed to generate device tree of {entry.dump_path}:\n{format_exception(e)}")
+		return BatchResult(entry, perf_counter() - start, format_exception(e))
+
+	return BatchResult(entry, perf_counter() - start)
+
+def run_batch(
+	entries: List[BatchEntry],
+	elf_cache: Optional[ELFCache] = None,
+	workers: int = 1,
+	jobs: int = 1,
+	hardlink: bool = False,
+	incremental: bool = False,
+) -> List[BatchResult]:
+	"""
+	Generate the device trees of all the entries, workers of them at the same time.
+
+	All of them share this process' registered sections, ignore rules, templates
+	and ELF cache, one failing doesn't stop the others.
+	"""
+	jobs = get_jobs_per_worker(workers, jobs)
+
+	with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+		return list(executor.map(
+			lambda entry: run_entry(entry, elf_cache, jobs, hardlink, incremental), entries
+		))
+
+def get_jobs_per_worker(workers: int, jobs: int) -> int:
+	"""Lower the jobs of each worker so that workers * jobs doesn't exceed the number of CPUs."""
+	cpus = cpu_count() or 1
+	if max(1, workers) * jobs <= cpus:
+		return jobs
+
+	capped_jobs = max(1, cpus // max(1, workers))
+	LOGW(f"{workers} workers * {jobs} jobs exceed the {cpus} CPUs, using {capped_jobs} jobs per worker")
+
+	return capped_jobs
+
+def format_report(results: List[BatchResult]) -> str:
+	"""Format a summary of a batch, one line per entry."""
+	lines = [
+		f"{'OK' if result.success else 'FAILED':<6} {result.time:>7.2f}s  "
+		f"{result.entry.dump_path} -> {result.entry.output_path}"
+		f"{'' if result.success else ': ' + result.error.strip().splitlines()[-1]}"
+		for result in results
+	]
+
+	failed = sum(not result.success for result in results)
+	lines.append(f"{len(results) - failed} succeeded, {failed} failed")
+
+	return "\n".join(lines)
@@ -5,143 +5,198 @@
 #
 
 from datetime import datetime
-from os import chmod
+from functools import cached_property
 from pathlib import Path
 from sebaubuntu_libs.libandroid.device_info import DeviceInfo
 from sebaubuntu_libs.libandroid.fstab import Fstab
 from sebaubuntu_libs.libandroid.partitions.partitions import Partitions
-from sebaubuntu_libs.libandroid.props import BuildProp
 from sebaubuntu_libs.liblogging import LOGI
-from sebaubuntu_libs.libpath import is_relative_to
 from sebaubuntu_libs.libreorder import strcoll_files_key
-from shutil import rmtree
 from stat import S_IRWXU, S_IRGRP, S_IROTH
+from typing import Dict, List, Optional
 
+from aospdtgen.proprietary_files.elf_cache import ELFCache
 from aospdtgen.proprietary_files.proprietary_files_list import ProprietaryFilesList
-from aospdtgen.templates import render_template
+from aospdtgen.templates import render_templates
 from aospdtgen.utils.boot_configuration import BootConfiguration
-from aospdtgen.utils.format_props import dump_partition_build_prop
+from aospdtgen.utils.file_copier import FileCopier
+from aospdtgen.utils.file_table import FileTable
+from aospdtgen.utils.format_props import get_partition_props, write_partition_build_prop
+from aospdtgen.utils.output_folder import OutputFolder
+from aospdtgen.utils.pipeline import Pipeline
+from aospdtgen.utils.profiler import profiler
+from aospdtgen.utils.prop_store import PropStore
 
 class DeviceTree:
 	"""Class representing an Android device tree."""
-	def __init__(self, path: Path):
-		"""Given a path to a dumpyara dump path, generate a device tree by parsing it."""
+	def __init__(self, path: Path, elf_cache: Optional[ELFCache] = None, jobs: int = 1):
+		"""
+		Given a path to a dumpyara dump path, generate a device tree by parsing it.
+
+		If an ELFCache is provided, it will be used to avoid parsing unchanged ELFs again.
+		With jobs > 1, independent parsing stages run concurrently and ELFs
+		get parsed in parallel using that many processes.
+		"""
 		self.path = path
+		self.elf_cache = elf_cache
+		self.jobs = jobs
 
 		self.current_year = str(datetime.now().year)
 
+		# Stages not depending on each other (e.g. the boot images extraction
+		# and the partitions parsing) can run at the same time
+		pipeline = Pipeline()
+		pipeline.add_stage("partitions", self._parse_partitions)
+		pipeline.add_stage("file_tables", self._index_files, ["partitions"])
+		pipeline.add_stage("device_info", self._parse_device_info, ["partitions"])
+		pipeline.add_stage("fstab", self._parse_fstab, ["file_tables"])
+		pipeline.add_stage("boot_configuration", self._extract_boot_images)
+		pipeline.add_stage("rootdir_files", self._get_rootdir_files, ["file_tables"])
+		pipeline.add_stage("proprietary_files_list", self._get_proprietary_files, ["file_tables"])
+		try:
+			with profiler.span("parse dump", "device_tree", path=str(self.path)):
+				pipeline.run(self.jobs)
+		except BaseException:
+			# Don't leave the boot images temporary files around
+			self.cleanup()
+			raise
+
+	def _parse_partitions(self):
 		LOGI("Figuring out partitions scheme")
 		self.partitions = Partitions(self.path)
 
 		self.system = self.partitions.system
 		self.vendor = self.partitions.vendor
 
+	def _index_files(self):
+		LOGI("Indexing partitions files")
+		self.file_tables = {
+			partition.model: FileTable(partition.path)
+			for partition in self.partitions.get_all_partitions()
+		}
+		self.vendor_files = self.file_tables[self.vendor.model]
+
+	def _parse_device_info(self):
 		LOGI("Parsing build props and device info")
-		self.build_prop = BuildProp()
-		for partition in self.partitions.get_all_partitions():
-			self.build_prop.import_props(partition.build_prop)
+		partitions = self.partitions.get_all_partitions()
+		self.prop_store = PropStore({
+			partition.model: partition.build_prop for partition in partitions
+		})
+
+		# Drop the partitions' own copies, everything reads from the store from now on
+		for partition in partitions:
+			partition.build_prop = self.prop_store.get_partition(partition.model)
+
+		self.build_prop = self.prop_store.merged
 		self.device_info = DeviceInfo(self.build_prop)
 
+	def _parse_fstab(self):
 		LOGI("Parsing fstab")
 		fstabs = [
-			file for file in self.vendor.files
-			if (is_relative_to(file.relative_to(self.vendor.path), "etc")
-		        and file.name.startswith("fstab."))
+			file for file in self.vendor_files.get_files("etc")
+			if file.name.startswith("fstab.")
 		]
 		assert fstabs, "No fstab found"
-		fstab = fstabs[0]
+		fstab = self.vendor_files.get_path(fstabs[0])
 		self.fstab = Fstab(fstab)
 
 		# Let the partitions know their fstab entries if any
 		for partition in self.partitions.get_all_partitions():
 			partition.fill_fstab_entry(self.fstab)
 
+	def _extract_boot_images(self):
 		LOGI("Extracting boot image")
-		self.boot_configuration = BootConfiguration(self.path)
+		self.boot_configuration = BootConfiguration(self.path, self.jobs)
 
+	def _get_rootdir_files(self):
 		LOGI("Getting list of rootdir files")
-		self.rootdir_bin_files = [file for file in self.vendor.files
-		                          if is_relative_to(file.relative_to(self.vendor.path), "bin")
-		                          and file.suffix == ".sh"]
+		self.rootdir_bin_files = [self.vendor_files.get_path(file)
+		                          for file in self.vendor_files.get_files("bin", ".sh")]
 		self.rootdir_bin_files.sort(key=strcoll_files_key)
 
-		self.rootdir_etc_files = [file for file in self.vendor.files
-		                          if is_relative_to(file.relative_to(self.vendor.path), "etc/init/hw")]
+		self.rootdir_etc_files = [self.vendor_files.get_path(file)
+		                          for file in self.vendor_files.get_files("etc/init/hw")]
 		self.rootdir_etc_files.sort(key=strcoll_files_key)
 
-		recovery_resources_location = (self.boot_configuration.recovery_aik_manager.ramdisk_path
-		                               if self.boot_configuration.recovery_aik_manager
-		                               else self.boot_configuration.boot_aik_manager.ramdisk_path)
-		self.rootdir_recovery_etc_files = [file for file in recovery_resources_location.iterdir()
-		                                   if is_relative_to(file.relative_to(recovery_resources_location), ".")
-		                                   and file.suffix == ".rc"]
-		self.rootdir_recovery_etc_files.sort(key=strcoll_files_key)
-
+	def _get_proprietary_files(self):
 		LOGI("Generating proprietary files list")
 		self.proprietary_files_list = ProprietaryFilesList(
-			[value for value in self.partitions.get_all_partitions()]
+			[value for value in self.partitions.get_all_partitions()],
+			self.elf_cache,
+			self.jobs,
+			self.file_tables,
 		)
 
-	def dump_to_folder(self, folder: Path):
-		"""Dump all makefiles, blueprint and prebuilts to a folder."""
-		if folder.is_dir():
-			rmtree(folder)
-		folder.mkdir(parents=True)
+	@cached_property
+	def rootdir_recovery_etc_files(self) -> List[Path]:
+		"""Recovery init scripts, they only get extracted the first time."""
+		recovery_resources_image = self.boot_configuration.recovery_resources_image
+		return sorted(recovery_resources_image.get_ramdisk_files(".rc"), key=strcoll_files_key)
+
+	def dump_to_folder(self, folder: Path, hardlink: bool = False, incremental: bool = False):
+		"""
+		Dump all makefiles, blueprint and prebuilts to a folder.
+
+		With hardlink=True, prebuilts and rootdir files on the same filesystem
+		of the folder get hardlinked instead of copied.
+		With incremental=True, the folder doesn't get emptied first,
+		only the files that changed get replaced and stale ones get removed.
+		"""
+		output = OutputFolder(folder, incremental, FileCopier(hardlink))
+
+		rendered_templates = self._render_templates()
 
 		# Makefiles/blueprints
-		self._render_template(folder, "Android.bp", comment_prefix="//")
-		self._render_template(folder, "Android.mk")
-		self._render_template(folder, "AndroidProducts.mk")
-		self._render_template(folder, "BoardConfig.mk")
-		self._render_template(folder, "device.mk")
-		self._render_template(folder, "extract-files.sh")
-		self._render_template(folder, "lineage_device.mk", out_file=f"lineage_{self.device_info.codename}.mk")
-		self._render_template(folder, "README.md")
-		self._render_template(folder, "setup-makefiles.sh")
+		for name, rendered_template in rendered_templates.items():
+			if "/" not in name:
+				output.write_text(name, rendered_template)
 
 		# Set permissions
-		chmod(folder / "extract-files.sh", S_IRWXU | S_IRGRP | S_IROTH)
-		chmod(folder / "setup-makefiles.sh", S_IRWXU | S_IRGRP | S_IROTH)
+		output.chmod("extract-files.sh", S_IRWXU | S_IRGRP | S_IROTH)
+		output.chmod("setup-makefiles.sh", S_IRWXU | S_IRGRP | S_IROTH)
 
 		# Proprietary files list
-		(folder / "proprietary-files.txt").write_text(
-				self.proprietary_files_list.get_formatted_list(self.device_info.build_description))
+		with output.open("proprietary-files.txt") as f:
+			self.proprietary_files_list.write_formatted_list(f, self.device_info.build_description)
 
-		# Dump build props
+		# Dump build props, skipping partitions without any
 		for partition in self.partitions.get_all_partitions():
-			dump_partition_build_prop(partition.build_prop, folder / f"{partition.model.name}.prop")
+			if not get_partition_props(partition.build_prop):
+				continue
+
+			with output.open(f"{partition.model.name}.prop") as f:
+				write_partition_build_prop(partition.build_prop, f)
 
 		# Dump boot image prebuilt files
-		prebuilts_path = folder / "prebuilts"
-		prebuilts_path.mkdir()
+		output.mkdir("prebuilts")
 
-		self.boot_configuration.copy_files_to_folder(prebuilts_path)
+		for name, file in self.boot_configuration.get_prebuilt_files().items():
+			output.copy(file, f"prebuilts/{name}")
 
 		# Dump rootdir
-		rootdir_path = folder / "rootdir"
-		rootdir_path.mkdir()
+		output.mkdir("rootdir")
 
-		self._render_template(rootdir_path, "rootdir_Android.bp", "Android.bp", comment_prefix="//")
-		self._render_template(rootdir_path, "rootdir_Android.mk", "Android.mk")
+		output.write_text("rootdir/Android.bp", rendered_templates["rootdir/Android.bp"])
+		output.write_text("rootdir/Android.mk", rendered_templates["rootdir/Android.mk"])
 
 		# rootdir/bin
-		rootdir_bin_path = rootdir_path / "bin"
-		rootdir_bin_path.mkdir()
+		output.mkdir("rootdir/bin")
 
 		for file in self.rootdir_bin_files:
-			(rootdir_bin_path / file.name).write_bytes(file.read_bytes())
+			output.copy(file, f"rootdir/bin/{file.name}")
 
 		# rootdir/etc
-		rootdir_etc_path = rootdir_path / "etc"
-		rootdir_etc_path.mkdir()
+		output.mkdir("rootdir/etc")
 
 		for file in self.rootdir_etc_files + self.rootdir_recovery_etc_files:
-			(rootdir_etc_path / file.name).write_bytes(file.read_bytes())
+			output.copy(file, f"rootdir/etc/{file.name}")
 
-		(rootdir_etc_path / self.fstab.fstab.name).write_text(self.fstab.format())
+		output.write_text(f"rootdir/etc/{self.fstab.fstab.name}", self.fstab.format())
 
 		# Manifest
-		(folder / "manifest.xml").write_text(str(self.vendor.manifest))
+		output.write_text("manifest.xml", str(self.vendor.manifest))
+
+		output.finish()
 
 	def cleanup(self) -> None:
 		"""
@@ -149,19 +204,45 @@ class DeviceTree:
 
 		After you call this, you should throw away this object and never use it anymore.
 		"""
-		self.boot_configuration.cleanup()
-
-	def _render_template(self, *args, comment_prefix: str = "#", **kwargs):
-		return render_template(
-			*args,
-			boot_configuration=self.boot_configuration,
-			comment_prefix=comment_prefix,
-			current_year=self.current_year,
-			device_info=self.device_info,
-			fstab=self.fstab,
-			rootdir_bin_files=self.rootdir_bin_files,
-			rootdir_etc_files=self.rootdir_etc_files,
-			rootdir_recovery_etc_files=self.rootdir_recovery_etc_files,
-			partitions=self.partitions,
-			**kwargs,
+		boot_configuration: Optional[BootConfiguration] = getattr(self, "boot_configuration", None)
+		if boot_configuration:
+			boot_configuration.cleanup()
+
+	def _render_templates(self) -> Dict[str, str]:
+		"""Render all the templates, return the output file name to rendered template."""
+		# Output file name to template and comment prefix
+		templates = {
+			"Android.bp": ("Android.bp", "//"),
+			"Android.mk": ("Android.mk", "#"),
+			"AndroidProducts.mk": ("AndroidProducts.mk", "#"),
+			"BoardConfig.mk": ("BoardConfig.mk", "#"),
+			"device.mk": ("device.mk", "#"),
+			"extract-files.sh": ("extract-files.sh", "#"),
+			f"lineage_{self.device_info.codename}.mk": ("lineage_device.mk", "#"),
+			"README.md": ("README.md", "#"),
+			"setup-makefiles.sh": ("setup-makefiles.sh", "#"),
+			"rootdir/Android.bp": ("rootdir_Android.bp", "//"),
+			"rootdir/Android.mk": ("rootdir_Android.mk", "#"),
+		}
+
+		# Shared by all the templates
+		context = {
+			"boot_configuration": self.boot_configuration,
+			"current_year": self.current_year,
+			"device_info": self.device_info,
+			"fstab": self.fstab,
+			"rootdir_bin_files": self.rootdir_bin_files,
+			"rootdir_etc_files": self.rootdir_etc_files,
+			"rootdir_recovery_etc_files": self.rootdir_recovery_etc_files,
+			"partitions": self.partitions,
+		}
+
+		rendered_templates = render_templates(
+			[
+				(template_file, {"comment_prefix": comment_prefix})
+				for template_file, comment_prefix in templates.values()
+			],
+			context,
 		)
+
+		return dict(zip(templates, rendered_templates))
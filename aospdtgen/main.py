@@ -5,12 +5,19 @@
 #
 
 from argparse import ArgumentParser
+from os import environ
 from pathlib import Path
 from sebaubuntu_libs.liblocale import setup_locale
 from sebaubuntu_libs.liblogging import setup_logging
+from sys import argv, exit
+from typing import List, Optional
 
 from aospdtgen import __version__ as version, current_path
+from aospdtgen.batch import format_report, get_entries, get_entries_from_manifest, run_batch
 from aospdtgen.device_tree import DeviceTree
+from aospdtgen.proprietary_files.elf_cache import ELF_CACHE_PATH, ELFCache
+from aospdtgen.server import DEFAULT_SOCKET_PATH, TOKEN_ENV, DeviceTreeServer, serve
+from aospdtgen.utils.profiler import profiler
 
 def main():
 	setup_logging()
@@ -18,18 +25,126 @@ def main():
 	print(f"Android device tree generator\n"
 	      f"Version {version}\n")
 
+	if argv[1:2] == ["serve"]:
+		serve_main(argv[2:])
+		return
+
 	parser = ArgumentParser(prog='python3 -m aospdtgen')
-	parser.add_argument("dump_path", type=Path,
-	                    help="path to an Android dump made with dumpyara")
+	parser.add_argument("dump_path", type=Path, nargs="*",
+	                    help="path to an Android dump made with dumpyara, "
+	                         "pass more than one to generate them as a batch "
+	                         "(use \"python3 -m aospdtgen serve -h\" for the server mode)")
 	parser.add_argument("-o", "--output", type=Path, default=current_path / "output",
-	                    help="custom output folder")
+	                    help="custom output folder (in a batch, each device tree "
+	                         "goes in a subfolder named after its dump)")
+	parser.add_argument("-m", "--manifest", type=Path,
+	                    help="file listing the dumps of a batch, one per line, "
+	                         "optionally followed by their output folder")
+	parser.add_argument("-w", "--workers", type=int, default=1,
+	                    help="number of dumps of a batch generated at the same time (default: 1)")
+	parser.add_argument("-j", "--jobs", type=int, default=1,
+	                    help="number of parallel jobs used to parse ELFs and unpack boot images, "
+	                         "per worker (default: 1, capped so that workers * jobs doesn't exceed "
+	                         "the number of CPUs)")
+	parser.add_argument("--hardlink", action="store_true",
+	                    help="hardlink prebuilts and rootdir files into the output folder "
+	                         "instead of copying them, when on the same filesystem")
+	parser.add_argument("--incremental", action="store_true",
+	                    help="only replace the output files that changed and remove stale ones, "
+	                         "instead of emptying the output folder first")
+	parser.add_argument("--no-elf-cache", action="store_true",
+	                    help="don't use the persistent ELF cache")
+	parser.add_argument("--clear-elf-cache", action="store_true",
+	                    help=f"clear the persistent ELF cache ({ELF_CACHE_PATH}) before starting")
+	parser.add_argument("--profile", action="store_true",
+	                    help="print how much time and memory each stage, section, template "
+	                         "and output took at the end")
+	parser.add_argument("--profile-trace", type=Path, metavar="TRACE",
+	                    help="write the profile as Chrome trace events JSON to this file, "
+	                         "viewable with Perfetto (implies --profile)")
 
 	args = parser.parse_args()
 
+	if not args.dump_path and not args.manifest:
+		parser.error("a dump path or a manifest is required")
+
 	setup_locale()
 
-	dump = DeviceTree(args.dump_path)
-	dump.dump_to_folder(args.output)
-	dump.cleanup()
+	if args.profile or args.profile_trace:
+		profiler.enable()
+
+	if args.clear_elf_cache:
+		ELFCache.clear()
+
+	elf_cache = None if args.no_elf_cache else ELFCache()
+
+	if len(args.dump_path) == 1 and not args.manifest:
+		dump = DeviceTree(args.dump_path[0], elf_cache=elf_cache, jobs=args.jobs)
+		dump.dump_to_folder(args.output, hardlink=args.hardlink, incremental=args.incremental)
+		dump.cleanup()
+
+		if elf_cache:
+			elf_cache.close()
+
+		report_profile(args.profile_trace)
+
+		print(f"\nDone! You can find the device tree in {str(args.output)}")
+		return
+
+	entries = get_entries(args.dump_path, args.output)
+	if args.manifest:
+		entries += get_entries_from_manifest(args.manifest, args.output)
+
+	results = run_batch(entries, elf_cache, args.workers, args.jobs, args.hardlink, args.incremental)
+
+	if elf_cache:
+		elf_cache.close()
+
+	report_profile(args.profile_trace)
+
+	print(f"\n{format_report(results)}")
+
+	if not all(result.success for result in results):
+		exit(1)
+
+def report_profile(trace_path: Optional[Path]):
+	if not profiler.enabled:
+		return
+
+	print(f"\n{profiler.format_summary()}")
+
+	if trace_path:
+		profiler.write_chrome_trace(trace_path)
+		print(f"\nProfile trace written to {trace_path}")
+
+def serve_main(args: List[str]):
+	parser = ArgumentParser(prog='python3 -m aospdtgen serve',
+	                        description="Generate device trees on request through a JSON API: "
+	                                    "POST /jobs with {\"dump_path\", \"output_path\", "
+	                                    "\"hardlink\", \"incremental\"}, GET /jobs and GET /jobs/<id>")
+	parser.add_argument("-s", "--socket", type=Path, default=DEFAULT_SOCKET_PATH,
+	                    help=f"Unix socket to listen on, only accessible by the current user "
+	                         f"(default: {DEFAULT_SOCKET_PATH})")
+	parser.add_argument("-p", "--port", type=int,
+	                    help=f"listen on this localhost port instead, clients must send "
+	                         f"\"Authorization: Bearer <token>\" with the token from ${TOKEN_ENV} "
+	                         f"(a random one gets printed if unset)")
+	parser.add_argument("-w", "--workers", type=int, default=1,
+	                    help="number of device trees generated at the same time (default: 1)")
+	parser.add_argument("-j", "--jobs", type=int, default=1,
+	                    help="number of parallel jobs used to parse ELFs and unpack boot images, "
+	                         "per worker (default: 1, capped so that workers * jobs doesn't exceed "
+	                         "the number of CPUs)")
+	parser.add_argument("--no-elf-cache", action="store_true",
+	                    help="don't use the persistent ELF cache")
+
+	args = parser.parse_args(args)
+
+	setup_locale()
+
+	elf_cache = None if args.no_elf_cache else ELFCache(keep_in_memory=True)
+
+	serve(DeviceTreeServer(elf_cache, args.workers, args.jobs), args.socket, args.port, environ.get(TOKEN_ENV))
 
-	print(f"\nDone! You can find the device tree in {str(args.output)}")
+	if elf_cache:
+		elf_cache.close()
@@ -0,0 +1,273 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from pathlib import Path
+import re
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from aospdtgen.utils.trie import Trie
+
+if TYPE_CHECKING:
+	from aospdtgen.proprietary_files.section import Section
+else:
+	Section = None
+
+INTERFACE_IMPL_PATTERN = r"{}@[0-9]+\\.[0-9]+-impl\\.so"
+"""Passthrough implementation lib of an interface (only HIDL)"""
+INTERFACE_LIB_PATTERN = r"{}(@[0-9]+\\.[0-9]+|-).*\\.so"
+"""Interface lib (AIDL and HIDL)"""
+INIT_SCRIPT_PATTERN = r"(init)?(.)?{}\\.rc"
+"""Init script of a binary"""
+
+def compile_alternation(values: Iterable[str], template: str = "{}") -> Optional[re.Pattern]:
+	"""
+	Compile a single regex that matches whenever template.format(value)
+	matches for any of the values, or None if there are no values.
+	"""
+	values = list(values)
+	if not values:
+		return None
+
+	return re.compile(template.format(f"(?:{'|'.join(f'(?:{value})' for value in values)})"))
+
+_WILDCARD_VALUE = re.compile(r"[A-Za-z0-9_@.-]+")
+"""Regexes made only of literal characters and wildcards."""
+
+class _Alternation:
+	"""Combined regex made of one named group per (section index, pattern) pair."""
+	def __init__(self):
+		"""Initialize an empty alternation."""
+		self.alternatives: List[Tuple[int, str]] = []
+
+		self._pattern: Optional[re.Pattern] = None
+		self._group_to_index: Dict[str, int] = {}
+
+	def add(self, pattern: str, index: int):
+		self.alternatives.append((index, pattern))
+		self._pattern = None
+
+	def match(self, string: str) -> Optional[int]:
+		"""
+		Return the lowest index of the patterns matching the start of the string.
+
+		Alternatives are tried left to right and they are stored in registration order,
+		so the first one that matches belongs to the first matching section.
+		"""
+		if not self.alternatives:
+			return None
+
+		if self._pattern is None:
+			self._compile()
+
+		match = self._pattern.match(string)
+		if match is None:
+			return None
+
+		return self._group_to_index[match.lastgroup]
+
+	def _compile(self):
+		self._group_to_index = {
+			f"_{n}": index for n, (index, _) in enumerate(self.alternatives)
+		}
+		self._pattern = re.compile("|".join(
+			f"(?P<_{n}>{pattern})" for n, (_, pattern) in enumerate(self.alternatives)
+		))
+
+class _TemplateAlternation:
+	"""
+	Combined regex for values formatted in a "{}<suffix>" template.
+
+	Values made only of literal characters and wildcards are stored in a trie,
+	so the suffix only gets matched after the few values matching the start of
+	the string, any other value falls back to a regular alternation.
+	"""
+	def __init__(self, template: str):
+		"""Initialize an empty alternation."""
+		assert template.startswith("{}"), "The template must start with the value"
+
+		self.template = template
+		self.suffix = re.compile(template[2:])
+
+		self.values = Trie()
+		self.fallback = _Alternation()
+
+	def add(self, value: str, index: int):
+		if _WILDCARD_VALUE.fullmatch(value):
+			self.values.add(value, index)
+		else:
+			self.fallback.add(self.template.format(value), index)
+
+	def match(self, string: str, start: int = 0) -> Optional[int]:
+		"""Return the lowest index of the patterns matching string[start:]."""
+		result = self.fallback.match(string[start:] if start else string)
+
+		for end, index in self.values.match_wildcard_prefixes(string, start):
+			if result is not None and index > result:
+				continue
+
+			if self.suffix.match(string, end):
+				result = index
+
+		return result
+
+class SectionClassifier:
+	"""
+	Lookup structures matching a file against all the registered sections at once.
+
+	Every file rule of a section (interfaces, hardware modules, APEXes, apps,
+	binaries, libraries, file names, folders and patterns) gets compiled into a
+	hash map, a trie or a combined regex that returns the lowest section index matching it, the first
+	matching section is then the lowest index among all the rules.
+	"""
+	def __init__(self):
+		"""Initialize an empty classifier."""
+		self.sections: List[Section] = []
+
+		self.catch_all: Optional[int] = None
+
+		self.interfaces = Trie()
+		self.interfaces_impls = _TemplateAlternation(INTERFACE_IMPL_PATTERN)
+		self.interfaces_libs = _TemplateAlternation(INTERFACE_LIB_PATTERN)
+		self.hardware_modules: Dict[str, int] = {}
+		self.apexes: Dict[str, int] = {}
+		self.apps: Dict[str, int] = {}
+		self.binaries: Dict[str, int] = {}
+		# INIT_SCRIPT_PATTERN without the "(init)?(.)?" prefix, handled when matching
+		self.binaries_init_scripts = _TemplateAlternation(r"{}\\.rc")
+		self.libraries: Dict[str, int] = {}
+		self.filenames: Dict[str, int] = {}
+		self.folders = Trie()
+		self.patterns = _Alternation()
+		self.properties: Dict[str, int] = {}
+		self.properties_prefixes = Trie()
+
+	def add_section(self, section: Section):
+		"""Compile the rules of a section, sections added first take precedence."""
+		index = len(self.sections)
+		self.sections.append(section)
+
+		if section.name == "Miscellaneous" and self.catch_all is None:
+			self.catch_all = index
+
+		for interface in section.interfaces:
+			self.interfaces.add(interface, index)
+			self.interfaces_impls.add(interface, index)
+			self.interfaces_libs.add(interface, index)
+
+		for hardware_module in section.hardware_modules:
+			self.hardware_modules.setdefault(hardware_module, index)
+
+		for apex in section.apexes:
+			self.apexes.setdefault(apex, index)
+
+		for app in section.apps:
+			self.apps.setdefault(app, index)
+
+		for binary in section.binaries:
+			self.binaries.setdefault(binary, index)
+			self.binaries_init_scripts.add(binary, index)
+
+		for library in section.libraries:
+			self.libraries.setdefault(library, index)
+
+		for filename in section.filenames:
+			self.filenames.setdefault(filename, index)
+
+		for folder in section.folders:
+			# Path.parents stringifies the root as "."
+			self.folders.add([] if folder == "." else folder.split("/"), index)
+
+		for pattern in section.patterns:
+			self.patterns.add(pattern, index)
+
+		for prefix, exact_match in section.properties_prefixes.items():
+			if exact_match:
+				self.properties.setdefault(prefix, index)
+			else:
+				self.properties_prefixes.add(prefix, index)
+
+	def get_section_index(self, file: Path) -> Optional[int]:
+		"""
+		Return the index of the first section matching the given file
+		(relative to the partition), or None if none matches.
+		"""
+		parts = file.parts
+		name = file.name
+		directory = parts[:-1]
+
+		candidates: List[Optional[int]] = [self.catch_all]
+
+		top = parts[0] if parts else None
+		subdir = parts[1] if len(parts) > 1 else None
+
+		is_bin = top == "bin"
+		is_lib = top in ("lib", "lib64")
+		is_lib_hw = is_lib and subdir == "hw"
+		is_etc_init = top == "etc" and subdir == "init"
+
+		# Interfaces
+		if (is_bin or is_etc_init
+				or (top == "etc" and subdir == "vintf"
+				    and len(parts) > 2 and parts[2] == "manifest")):
+			candidates.append(self.interfaces.match_substrings(name))
+
+		if is_lib_hw:
+			candidates.append(self.interfaces_impls.match(name))
+
+		if is_lib:
+			candidates.append(self.interfaces_libs.match(name))
+
+		# Hardware modules
+		if is_lib_hw and file.suffix == ".so":
+			position = name.find(".")
+			while position != -1:
+				candidates.append(self.hardware_modules.get(name[:position]))
+				position = name.find(".", position + 1)
+
+		# APEXes
+		if top == "apex" and file.suffix == ".apex":
+			candidates.append(self.apexes.get(file.stem))
+
+		# Apps
+		if top in ("app", "priv-app") and file.suffix == ".apk":
+			candidates.append(self.apps.get(file.stem))
+
+		# Binaries
+		if is_bin:
+			candidates.append(self.binaries.get(name))
+
+		# Init scripts
+		if is_etc_init:
+			# "(init)?(.)?" can only consume "", any character, "init" or "init" and any character
+			for start in ([0, 1, 4, 5] if name.startswith("init") else [0, 1]):
+				if start in (1, 5) and (len(name) < start or name[start - 1] == "\n"):
+					continue
+
+				candidates.append(self.binaries_init_scripts.match(name, start))
+
+		# Libraries
+		if is_lib and file.suffix == ".so":
+			candidates.append(self.libraries.get(file.stem))
+
+		# Filenames
+		candidates.append(self.filenames.get(name))
+
+		# Folders
+		candidates.append(self.folders.match_prefixes(directory))
+
+		# Patterns
+		candidates.append(self.patterns.match(str(file)))
+
+		return min((index for index in candidates if index is not None), default=None)
+
+	def get_property_section_index(self, prop: str) -> Optional[int]:
+		"""
+		Return the index of the first section whose property_match() would return True
+		for the given property, or None if none matches.
+		"""
+		candidates = [self.properties.get(prop), self.properties_prefixes.match_prefixes(prop)]
+
+		return min((index for index in candidates if index is not None), default=None)
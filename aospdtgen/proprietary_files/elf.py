@@ -4,12 +4,270 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+from concurrent.futures import ProcessPoolExecutor
+from mmap import ACCESS_READ, mmap
+from multiprocessing import get_all_start_methods, get_context
 from pathlib import Path
-from typing import List
+from struct import error as StructError, unpack_from
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
 
-def get_shared_libs(files: List[Path]):
+from aospdtgen.utils.file_table import FileEntry, FileTable
+from aospdtgen.utils.profiler import profiler
+
+if TYPE_CHECKING:
+	from aospdtgen.proprietary_files.elf_cache import ELFCache
+else:
+	ELFCache = None
+
+MP_START_METHOD = "forkserver" if "forkserver" in get_all_start_methods() else "spawn"
+"""
+How to start the ELF parsing processes. They get started from a pipeline stage
+thread while other stages run, forking then could copy locks held by the other
+threads (logging, sqlite, ...) and deadlock the children.
+"""
+
+PROCESS_POOL_MIN_FILES = 20000
+"""
+Below this many ELFs to parse, starting the processes costs more than it saves
+(a process pool start is ~0.3s, about 10k ELFs parsed serially).
+"""
+
+ELF_MAGIC = b"\x7fELF"
+
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+
+ELFDATA2LSB = 1
+ELFDATA2MSB = 2
+
+PT_LOAD = 1
+PT_DYNAMIC = 2
+
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_SONAME = 14
+
+MACHINE_TO_ARCH = {
+	3: "x86", # EM_386
+	40: "arm", # EM_ARM
+	62: "x86_64", # EM_X86_64
+	183: "arm64", # EM_AARCH64
+}
+
+def get_shared_libs(files: Iterable[Path]):
 	for lib in files:
 		if not lib.suffix == ".so":
 			continue
 
 		yield lib
+
+class ELFInfo:
+	"""Dynamic linking info of an ELF."""
+	def __init__(
+		self,
+		needed_libs: Set[str],
+		soname: Optional[str] = None,
+		machine: Optional[int] = None,
+	):
+		"""Initialize an ELFInfo object."""
+		self.needed_libs = needed_libs
+		self.soname = soname
+		self.machine = machine
+
+	@property
+	def arch(self) -> Optional[str]:
+		"""Android architecture name of the ELF, if known."""
+		return MACHINE_TO_ARCH.get(self.machine)
+
+	@classmethod
+	def from_file(cls, file: Path):
+		"""
+		Parse an ELF, returns an empty ELFInfo if the file isn't a valid ELF.
+
+		Only the ELF header, the program headers, the dynamic segment and the
+		needed strings get read, straight from a memory map of the file.
+		"""
+		with file.open("rb") as f:
+			if f.read(len(ELF_MAGIC)) != ELF_MAGIC:
+				return cls(set())
+
+			with mmap(f.fileno(), 0, access=ACCESS_READ) as data:
+				try:
+					return cls._from_buffer(data)
+				except (IndexError, StructError, ValueError):
+					return cls(set())
+
+	@classmethod
+	def _from_buffer(cls, data):
+		elf_class, elf_data = data[4], data[5]
+
+		if elf_data == ELFDATA2LSB:
+			endianness = "<"
+		elif elf_data == ELFDATA2MSB:
+			endianness = ">"
+		else:
+			raise ValueError(f"Unknown ELF data encoding {elf_data}")
+
+		if elf_class == ELFCLASS32:
+			word = "I"
+			phoff_offset, phentsize_offset = 28, 42
+			dyn_format = f"{endianness}iI"
+		elif elf_class == ELFCLASS64:
+			word = "Q"
+			phoff_offset, phentsize_offset = 32, 54
+			dyn_format = f"{endianness}qQ"
+		else:
+			raise ValueError(f"Unknown ELF class {elf_class}")
+
+		machine, = unpack_from(f"{endianness}H", data, 18)
+		phoff, = unpack_from(f"{endianness}{word}", data, phoff_offset)
+		phentsize, phnum = unpack_from(f"{endianness}HH", data, phentsize_offset)
+
+		# Program headers, we need the dynamic segment and the loadable ones
+		# to translate the string table address into a file offset
+		loads = []
+		dynamic = None
+		for i in range(phnum):
+			offset = phoff + i * phentsize
+			if elf_class == ELFCLASS32:
+				p_type, p_offset, p_vaddr, _, p_filesz = unpack_from(f"{endianness}5I", data, offset)
+			else:
+				p_type, _, p_offset, p_vaddr, _, p_filesz = unpack_from(f"{endianness}IIQQQQ", data, offset)
+
+			if p_type == PT_LOAD:
+				loads.append((p_vaddr, p_offset, p_filesz))
+			elif p_type == PT_DYNAMIC:
+				dynamic = (p_offset, p_filesz)
+
+		if dynamic is None:
+			return cls(set(), machine=machine)
+
+		needed_offsets: List[int] = []
+		soname_offset: Optional[int] = None
+		strtab_address: Optional[int] = None
+
+		dyn_offset, dyn_size = dynamic
+		dyn_entsize = 8 if elf_class == ELFCLASS32 else 16
+		for offset in range(dyn_offset, dyn_offset + dyn_size - dyn_entsize + 1, dyn_entsize):
+			d_tag, d_val = unpack_from(dyn_format, data, offset)
+			if d_tag == DT_NULL:
+				break
+			elif d_tag == DT_NEEDED:
+				needed_offsets.append(d_val)
+			elif d_tag == DT_SONAME:
+				soname_offset = d_val
+			elif d_tag == DT_STRTAB:
+				strtab_address = d_val
+
+		strtab = None
+		if strtab_address is not None:
+			for p_vaddr, p_offset, p_filesz in loads:
+				if p_vaddr <= strtab_address < p_vaddr + p_filesz:
+					strtab = strtab_address - p_vaddr + p_offset
+					break
+
+		if strtab is None:
+			return cls(set(), machine=machine)
+
+		def get_string(offset: int) -> str:
+			start = strtab + offset
+			end = data.find(b"\0", start)
+			if end == -1:
+				raise ValueError("Unterminated string")
+
+			return data[start:end].decode("latin-1")
+
+		return cls(
+			{get_string(offset) for offset in needed_offsets},
+			get_string(soname_offset) if soname_offset is not None else None,
+			machine,
+		)
+
+def get_elf_info(file: Path) -> ELFInfo:
+	"""Parse an ELF, see ELFInfo.from_file()."""
+	return ELFInfo.from_file(file)
+
+def get_elf_infos(
+	files: List[Path], jobs: int = 1, elf_cache: Optional[ELFCache] = None
+) -> Dict[Path, ELFInfo]:
+	"""
+	Parse many ELFs at once, spreading the files not found in the cache
+	over a pool of jobs processes if there are enough of them.
+	"""
+	elf_infos: Dict[Path, ELFInfo] = {}
+
+	with profiler.span("parse ELFs", "elf", files=len(files)):
+		to_parse: List[Path] = []
+		signatures: Dict[Path, Tuple[int, int, int]] = {}
+		for file in files:
+			elf_info = None
+			if elf_cache:
+				signatures[file] = elf_cache.get_signature(file)
+				elf_info = elf_cache.get_cached_elf_info(file, signatures[file])
+
+			if elf_info is None:
+				to_parse.append(file)
+			else:
+				elf_infos[file] = elf_info
+
+		if jobs > 1 and len(to_parse) >= PROCESS_POOL_MIN_FILES:
+			with ProcessPoolExecutor(max_workers=jobs, mp_context=get_context(MP_START_METHOD)) as executor:
+				chunksize = len(to_parse) // (jobs * 4) + 1
+				parsed = executor.map(get_elf_info, to_parse, chunksize=chunksize)
+				elf_infos.update(zip(to_parse, parsed))
+		else:
+			elf_infos.update((file, get_elf_info(file)) for file in to_parse)
+
+		if elf_cache:
+			for file in to_parse:
+				elf_cache.add_elf_info(file, elf_infos[file], signatures[file])
+
+	return elf_infos
+
+class SharedLibIndex:
+	"""Index of a partition's shared libs by file name, with the libs needed by each ELF."""
+	def __init__(
+		self,
+		file_table: FileTable,
+		files: Iterable[FileEntry],
+		elf_cache: Optional[ELFCache] = None,
+		elf_infos: Optional[Dict[Path, ELFInfo]] = None,
+	):
+		"""
+		Index the shared libs among the given files of the file table.
+
+		ELFs already parsed (e.g. with get_elf_infos()) can be passed in elf_infos,
+		any other ELF will be parsed when first needed.
+		"""
+		self.file_table = file_table
+		self.elf_cache = elf_cache
+		self.elf_infos = elf_infos or {}
+
+		self.libs: Dict[str, List[FileEntry]] = {}
+		for lib in get_shared_libs(files):
+			self.libs.setdefault(lib.name, []).append(lib)
+
+		self.unowned_libs = sum(len(libs) for libs in self.libs.values())
+		"""Number of indexed libs not owned by any section yet, the sections update it as they claim them"""
+
+		self.needed_libs: Dict[FileEntry, Set[str]] = {}
+
+	def get_libs(self, name: str) -> List[FileEntry]:
+		"""Get all the shared libs with the given file name."""
+		return self.libs.get(name, [])
+
+	def get_needed_libs(self, file: FileEntry) -> Set[str]:
+		"""Get the libs needed by an ELF, parsing it only the first time."""
+		needed_libs = self.needed_libs.get(file)
+		if needed_libs is None:
+			path = self.file_table.get_path(file)
+			elf_info = self.elf_infos.get(path)
+			if elf_info is None:
+				with profiler.span("get ELF info", "elf"):
+					elf_info = (self.elf_cache.get_elf_info(path) if self.elf_cache
+					            else ELFInfo.from_file(path))
+			needed_libs = elf_info.needed_libs
+			self.needed_libs[file] = needed_libs
+
+		return needed_libs
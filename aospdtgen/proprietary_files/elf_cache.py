@@ -0,0 +1,177 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from collections import OrderedDict
+from json import dumps, loads
+from os import environ
+from os.path import abspath
+from pathlib import Path
+from sebaubuntu_libs.liblogging import LOGI
+from sqlite3 import connect
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from aospdtgen.proprietary_files.elf import ELFInfo
+
+ELF_CACHE_PATH = (
+	Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "aospdtgen" / "elf_cache.sqlite3"
+)
+"""Default location of the persistent ELF cache"""
+
+SCHEMA_VERSION = 2
+"""Bump this whenever the stored data changes, the cache will get rebuilt"""
+
+MEMORY_CACHE_SIZE = 20000
+"""How many entries to keep in memory at most with keep_in_memory=True, a few dumps worth of ELFs"""
+
+class ELFCache:
+	"""
+	Persistent cache of ELFInfo objects.
+
+	Entries are keyed by absolute path and are only valid while
+	the file size, modification time and inode are unchanged.
+	The cache can be used from any thread.
+
+	With keep_in_memory=True, the last memory_size entries looked up or added are
+	also kept in memory, so long running processes don't query the database again
+	for the ELFs of the dumps they handle repeatedly.
+	"""
+	def __init__(self, path: Path = ELF_CACHE_PATH, keep_in_memory: bool = False,
+	             memory_size: int = MEMORY_CACHE_SIZE):
+		"""Open (or create) the cache database."""
+		self.path = path
+		self.keep_in_memory = keep_in_memory
+		self.memory_size = memory_size
+
+		self.hits = 0
+		self.misses = 0
+
+		self._pending: List[Tuple] = []
+		self._memory: OrderedDict[str, Tuple[Tuple[int, int, int], ELFInfo]] = OrderedDict()
+		self._lock = Lock()
+
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self._connection = connect(str(self.path), check_same_thread=False)
+
+		if self._connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+			self._connection.execute("DROP TABLE IF EXISTS elfs")
+			self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+		self._connection.execute(
+			"CREATE TABLE IF NOT EXISTS elfs ("
+			"path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, inode INTEGER, "
+			"needed_libs TEXT, soname TEXT, machine INTEGER)"
+		)
+
+	@staticmethod
+	def clear(path: Path = ELF_CACHE_PATH):
+		"""Delete the cache database."""
+		if path.is_file():
+			path.unlink()
+
+	def get_elf_info(self, file: Path) -> ELFInfo:
+		"""Get the ELFInfo of a file, parsing it only if not cached or changed."""
+		signature = self.get_signature(file)
+
+		elf_info = self.get_cached_elf_info(file, signature)
+		if elf_info is None:
+			elf_info = ELFInfo.from_file(file)
+			self.add_elf_info(file, elf_info, signature)
+
+		return elf_info
+
+	def get_cached_elf_info(
+		self, file: Path, signature: Optional[Tuple[int, int, int]] = None
+	) -> Optional[ELFInfo]:
+		"""
+		Get the cached ELFInfo of a file, or None if not cached or changed.
+
+		The file gets stat'ed unless its get_signature() is given.
+		"""
+		path = abspath(file)
+		if signature is None:
+			signature = self.get_signature(file)
+
+		with self._lock:
+			if path in self._memory:
+				memory_signature, elf_info = self._memory[path]
+				if memory_signature == signature:
+					self._memory.move_to_end(path)
+					self.hits += 1
+					return elf_info
+
+			row = self._connection.execute(
+				"SELECT size, mtime, inode, needed_libs, soname, machine FROM elfs WHERE path = ?",
+				(path,),
+			).fetchone()
+
+			if row is None or tuple(row[:3]) != signature:
+				self.misses += 1
+				return None
+
+			self.hits += 1
+
+			elf_info = ELFInfo(set(loads(row[3])), row[4], row[5])
+			if self.keep_in_memory:
+				self._keep_in_memory(path, signature, elf_info)
+
+		return elf_info
+
+	def add_elf_info(
+		self, file: Path, elf_info: ELFInfo, signature: Optional[Tuple[int, int, int]] = None
+	):
+		"""
+		Cache the ELFInfo of a file, it will be written on the next save().
+
+		The file gets stat'ed unless its get_signature() is given.
+		"""
+		path = abspath(file)
+		if signature is None:
+			signature = self.get_signature(file)
+		entry = (
+			path,
+			*signature,
+			dumps(sorted(elf_info.needed_libs)),
+			elf_info.soname,
+			elf_info.machine,
+		)
+
+		with self._lock:
+			self._pending.append(entry)
+			if self.keep_in_memory:
+				self._keep_in_memory(path, signature, elf_info)
+
+	def _keep_in_memory(self, path: str, signature: Tuple[int, int, int], elf_info: ELFInfo):
+		"""Add an entry to the in memory LRU, the lock must be held."""
+		self._memory[path] = (signature, elf_info)
+		self._memory.move_to_end(path)
+
+		while len(self._memory) > self.memory_size:
+			self._memory.popitem(last=False)
+
+	@staticmethod
+	def get_signature(file: Path) -> Tuple[int, int, int]:
+		"""Get the size, modification time in nanoseconds and inode number of a file."""
+		stat = file.stat()
+		return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+	def save(self):
+		"""Write the newly parsed entries to disk."""
+		with self._lock:
+			if self._pending:
+				self._connection.executemany(
+					"INSERT OR REPLACE INTO elfs VALUES (?, ?, ?, ?, ?, ?, ?)", self._pending
+				)
+				self._pending.clear()
+
+			self._connection.commit()
+
+	def close(self):
+		"""Save and close the cache. Do not use this object anymore after calling this."""
+		self.save()
+		self._connection.close()
+
+		LOGI(f"ELF cache: {self.hits} hits, {self.misses} misses")
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Regenerate the sections registry after changing the sections."""
+
+from pprint import pformat
+
+from aospdtgen import sections_path
+from aospdtgen.proprietary_files.registry import REGISTRY_PATH, REGISTRY_VERSION, get_sources_hash
+from aospdtgen.proprietary_files.section import Section, sections
+
+SECTION_ATTRIBUTES = [
+	"name",
+	"interfaces",
+	"hardware_modules",
+	"apexes",
+	"apps",
+	"binaries",
+	"libraries",
+	"filenames",
+	"folders",
+	"patterns",
+	"properties_prefixes",
+]
+"""Section class attributes saved in the registry"""
+
+def format_registry(sources_hash: str) -> str:
+	"""Format the definitions of the registered sections as a registry module."""
+	lines = [
+		"#",
+		"# Copyright (C) 2024 The LineageOS Project",
+		"#",
+		"# SPDX-License-Identifier: Apache-2.0",
+		"#",
+		"# Generated by python3 -m aospdtgen.proprietary_files.generate_registry, do not edit.",
+		"#",
+		"",
+		f"REGISTRY_VERSION = {REGISTRY_VERSION}",
+		"",
+		f"SOURCES_HASH = {sources_hash!r}",
+		"",
+		"SECTIONS = [",
+	]
+
+	for section in sections:
+		section_class = type(section)
+
+		# Only keep what differs from the base section
+		attributes = {
+			attribute: getattr(section_class, attribute)
+			for attribute in SECTION_ATTRIBUTES
+			if getattr(section_class, attribute) != getattr(Section, attribute)
+		}
+
+		lines.append(f"\t({section_class.__name__!r}, {{")
+		for attribute, value in attributes.items():
+			formatted_value = pformat(value, indent=0, width=100).replace("\n", "\n\t\t")
+			lines.append(f"\t\t{attribute!r}: {formatted_value},")
+		lines.append("\t}),")
+
+	lines.append("]")
+	lines.append("")
+
+	return "\n".join(lines)
+
+def main():
+	# If the registry was up to date the sections come from it, writing them back changes nothing
+	REGISTRY_PATH.write_text(format_registry(get_sources_hash(sections_path)))
+	print(f"Wrote {len(sections)} sections to {REGISTRY_PATH}")
+
+if __name__ == '__main__':
+	main()
@@ -7,6 +7,9 @@
 from pathlib import Path
 import re
 from sebaubuntu_libs.libstring import removeprefix
+from typing import Iterable, List
+
+from aospdtgen.utils.trie import Trie
 
 IGNORE_BINARIES = [
 	"awk", # https://cs.android.com/android/platform/superproject/main/+/main:external/one-true-awk/Android.bp
@@ -972,31 +975,44 @@ IGNORE_PATTERNS = [re.compile(pattern) for pattern in [
 	"lib(64)?/libprotobuf-cpp-(full|lite)-.*.so",
 ]]
 
-def is_blob_allowed(file: Path) -> bool:
-	"""
-	Check if the lib is not in the disallowed list.
-	"""
-	if file.name in IGNORE_BINARIES:
-		return False
+class BlobFilter:
+	"""The ignore rules above, compiled into hash sets, a folders trie and a single regex."""
+	def __init__(self):
+		"""Compile the ignore rules."""
+		self.names = frozenset(IGNORE_BINARIES + IGNORE_SHARED_LIBS + IGNORE_FILENAMES)
+		self.extensions = frozenset(IGNORE_EXTENSIONS)
+		self.paths = frozenset(IGNORE_PATHS)
+
+		self.folders = Trie()
+		for folder in IGNORE_FOLDERS:
+			# Path.parents stringifies the root as "."
+			self.folders.add([] if folder == "." else folder.split("/"), 0)
 
-	if file.name in IGNORE_SHARED_LIBS:
-		return False
+		self.pattern = re.compile("|".join(f"(?:{pattern.pattern})" for pattern in IGNORE_PATTERNS))
 
-	if file.name in IGNORE_FILENAMES:
-		return False
+	def is_allowed(self, file: Path) -> bool:
+		"""Check if the file (relative to the partition) is not in the disallowed list."""
+		if file.name in self.names:
+			return False
 
-	if removeprefix(file.suffix, '.') in IGNORE_EXTENSIONS:
-		return False
+		if removeprefix(file.suffix, '.') in self.extensions:
+			return False
 
-	for folder in [str(folder) for folder in file.parents]:
-		if folder in IGNORE_FOLDERS:
+		if self.folders.match_prefixes(file.parts[:-1]) is not None:
 			return False
 
-	if str(file) in IGNORE_PATHS:
-		return False
+		file_str = str(file)
 
-	for pattern in IGNORE_PATTERNS:
-		if pattern.match(str(file)):
+		if file_str in self.paths:
 			return False
 
-	return True
+		if self.pattern.match(file_str):
+			return False
+
+		return True
+
+	def filter_allowed(self, files: Iterable[Path]) -> List[Path]:
+		"""Return the allowed files (relative to the partition) among the given ones."""
+		return [file for file in files if self.is_allowed(file)]
+
+blob_filter = BlobFilter()
@@ -4,55 +4,109 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+from array import array
 from sebaubuntu_libs.libandroid.partitions.partition import AndroidPartition
-from sebaubuntu_libs.libandroid.partitions.partition_model import TREBLE
-from typing import List, Optional
+from sebaubuntu_libs.libandroid.partitions.partition_model import TREBLE, PartitionModel
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
 
-from aospdtgen.proprietary_files.ignore import is_blob_allowed
-from aospdtgen.proprietary_files.section import Section, sections
+from aospdtgen.proprietary_files.elf import PROCESS_POOL_MIN_FILES, ELFInfo, SharedLibIndex, get_elf_infos
+from aospdtgen.proprietary_files.elf_cache import ELFCache
+from aospdtgen.proprietary_files.ignore import blob_filter
+from aospdtgen.proprietary_files.section import ELF_FOLDERS, UNOWNED, Section, classifier, sections
+from aospdtgen.utils.file_table import FileEntry, FileTable
 
 class ProprietaryFilesList:
 	"""Class representing a proprietary files list."""
-	def __init__(self, partitions: List[AndroidPartition]):
-		"""Initialize a new ProprietaryFilesList object."""
+	def __init__(
+		self,
+		partitions: List[AndroidPartition],
+		elf_cache: Optional[ELFCache] = None,
+		jobs: int = 1,
+		file_tables: Optional[Dict[PartitionModel, FileTable]] = None,
+	):
+		"""
+		Initialize a new ProprietaryFilesList object.
+
+		With jobs > 1 and at least PROCESS_POOL_MIN_FILES ELFs, they all get parsed
+		upfront using a pool of processes, otherwise each one is parsed when first needed.
+		The partitions' file tables can be passed in file_tables to avoid walking them again.
+		"""
 		self.partitions = partitions
+		self.elf_cache = elf_cache
+		self.jobs = jobs
+		self.file_tables = dict(file_tables or {})
 
-		self.sections = sections
+		# Fresh sections, the registered ones are shared by every list made in this process
+		self.sections = [type(section)() for section in sections]
 		misc_section = Section()
 
+		partitions_files: List[Tuple[List[FileEntry], Dict[int, List[FileEntry]]]] = []
+		elfs: List[Path] = []
+
 		for partition in self.partitions:
-			files = []
+			file_table = self.file_tables.get(partition.model)
+			if file_table is None:
+				file_table = FileTable(partition.path)
+				self.file_tables[partition.model] = file_table
+
+			files: List[FileEntry] = []
+			files_by_section: Dict[int, List[FileEntry]] = {}
+
+			# Filter out ignored files
+			for file in blob_filter.filter_allowed(file_table.files):
+				files.append(file)
+
+				index = classifier.get_section_index(file)
+				if index is not None:
+					files_by_section.setdefault(index, []).append(file)
+
+				if file.top in ELF_FOLDERS:
+					elfs.append(file_table.get_path(file))
 
-			for file in partition.files:
-				file_relative = file.relative_to(partition.path)
-				# Filter out ignored files
-				if is_blob_allowed(file_relative):
-					files.append(file)
+			partitions_files.append((files, files_by_section))
 
-			for section in self.sections:
-				files = section.add_files(files, partition)
+		elf_infos: Dict[Path, ELFInfo] = {}
+		if self.jobs > 1 and len(elfs) >= PROCESS_POOL_MIN_FILES:
+			elf_infos = get_elf_infos(elfs, self.jobs, self.elf_cache)
+
+		for partition, (files, files_by_section) in zip(self.partitions, partitions_files):
+			file_table = self.file_tables[partition.model]
+			shared_lib_index = SharedLibIndex(file_table, files, self.elf_cache, elf_infos)
+
+			# Owner section of each file, indexed by file ID
+			owners = array("i", [UNOWNED]) * len(file_table.files)
+
+			# Classify the files in a single pass, then let the sections
+			# claim them in order, so the first matching section wins
+			for index in sorted(files_by_section):
+				matched = [file for file in files_by_section[index] if owners[file.id] == UNOWNED]
+				if not matched:
+					continue
+
+				self.sections[index].add_matched_files(
+					matched, partition, shared_lib_index, owners, index
+				)
 
 			if partition.model.group != TREBLE:
 				continue
 
-			misc_section.add_files(files, partition)
+			misc_section.add_matched_files(
+				[file for file in files if owners[file.id] == UNOWNED],
+				partition, shared_lib_index, owners, len(self.sections),
+			)
 
 		self.sections.append(misc_section)
 
-	def __str__(self) -> str:
-		return self.get_formatted_list()
-
-	def get_formatted_list(self, build_description: Optional[str] = None) -> str:
-		result = ""
+	def write_formatted_list(self, f: TextIO, build_description: Optional[str] = None):
+		"""Write the formatted list to a file-like object, one line at a time."""
 		if build_description:
-			result += f"# Unpinned blobs from {build_description}\n"
+			f.write(f"# Unpinned blobs from {build_description}\n")
 
 		for section in self.sections:
 			if not section.files:
 				continue
 
-			result += (f"\n# {section.name}\n")
-			result += "\n".join(str(file) for file in section.get_files())
-			result += "\n"
-
-		return result
+			f.write(f"\n# {section.name}\n")
+			for file in section.get_files():
+				f.write(f"{file}\n")
@@ -0,0 +1,64 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Prebuilt registry of the sections, to avoid importing every section module at startup.
+
+The registry is a generated module holding the definitions of all the sections,
+it's only used while the hash of the sections sources matches the one it was
+generated from, else (or with AOSPDTGEN_DYNAMIC_SECTIONS=1 set) the section
+modules get imported like before.
+
+To update it after changing the sections, run:
+python3 -m aospdtgen.proprietary_files.generate_registry
+"""
+
+from hashlib import sha256
+from os import environ, scandir
+from pathlib import Path
+
+from aospdtgen.proprietary_files.section import Section, register_section, register_sections
+
+DYNAMIC_SECTIONS_ENV = "AOSPDTGEN_DYNAMIC_SECTIONS"
+"""Set this environment variable to import the section modules instead of using the registry"""
+
+REGISTRY_PATH = Path(__file__).parent / "sections_registry.py"
+
+REGISTRY_VERSION = 1
+"""Bump this whenever the registry format changes"""
+
+def get_sources_hash(sections_path: Path) -> str:
+	"""Hash the names and content of the section modules."""
+	sources_hash = sha256()
+
+	with scandir(sections_path) as entries:
+		files = sorted(entry.name for entry in entries if entry.name.endswith(".py"))
+
+	for file in files:
+		sources_hash.update(file.encode())
+		sources_hash.update((sections_path / file).read_bytes())
+
+	return sources_hash.hexdigest()
+
+def load_sections(sections_path: Path):
+	"""Register all the sections, from the registry if it's up to date."""
+	if environ.get(DYNAMIC_SECTIONS_ENV) or not load_registry(sections_path):
+		register_sections(sections_path)
+
+def load_registry(sections_path: Path) -> bool:
+	"""Register the sections of the registry, return False if it's missing or out of date."""
+	try:
+		from aospdtgen.proprietary_files import sections_registry
+	except ImportError:
+		return False
+
+	if (sections_registry.REGISTRY_VERSION != REGISTRY_VERSION
+			or sections_registry.SOURCES_HASH != get_sources_hash(sections_path)):
+		return False
+
+	for class_name, attributes in sections_registry.SECTIONS:
+		register_section(type(class_name, (Section,), attributes))
+
+	return True
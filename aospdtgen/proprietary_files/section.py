@@ -7,17 +7,27 @@
 from importlib import import_module
 from pathlib import Path
 from pkgutil import iter_modules
-from re import match
-from sebaubuntu_libs.libandroid.elf.elf import ELF
+from re import Pattern
 from sebaubuntu_libs.libandroid.partitions.partition import AndroidPartition
 from sebaubuntu_libs.libexception import format_exception
 from sebaubuntu_libs.liblogging import LOGE
-from sebaubuntu_libs.libpath import is_relative_to
 from sebaubuntu_libs.libreorder import strcoll_files_key
 from sebaubuntu_libs.libstring import removesuffix
-from typing import Dict, List, Type
-
-from aospdtgen.proprietary_files.elf import get_shared_libs
+from typing import Dict, List, MutableSequence, Optional, Set, Tuple, Type
+
+from aospdtgen.proprietary_files.classifier import (
+	INTERFACE_LIB_PATTERN,
+	SectionClassifier,
+	compile_alternation,
+)
+from aospdtgen.proprietary_files.elf import SharedLibIndex, get_shared_libs
+from aospdtgen.utils.file_table import FileEntry
+from aospdtgen.utils.profiler import profiler
+
+ELF_FOLDERS = ("bin", "lib", "lib64")
+"""Top-level folders of a partition holding ELFs"""
+UNOWNED = -1
+"""Owner of the files not added to any section yet"""
 
 class Section:
 	"""Class representing a proprietary files list section."""
@@ -46,134 +56,65 @@ class Section:
 
 	def __init__(self):
 		"""Initialize the section."""
-		self.files: List[Path] = []
-
-	def add_files(self, files: List[Path], partition: AndroidPartition):
-		matched: List[Path] = []
-		not_matched: List[Path] = []
-
-		for file in files:
-			file_relative = file.relative_to(partition.path)
-			(matched if self.file_match(file_relative) else not_matched).append(file)
-
-		# Handle shared libs
-		for file in matched:
-			file_relative = file.relative_to(partition.path)
-			# Check only ELFs
-			if (not is_relative_to(file_relative, "bin")
-					and not is_relative_to(file_relative, "lib")
-					and not is_relative_to(file_relative, "lib64")):
-				continue
-
-			# Add shared libs used by the section ELFs
-			needed_libs = ELF.get_needed_libs(file)
-			for lib in needed_libs:
-				# Skip the lib if it belongs to another section
-				skip = False
-
-				for interface in known_interfaces:
-					if match(fr"{interface}(@[0-9]+\\.[0-9]+|-).*\\.so", lib):
-						skip = True
-						break
-
-				if removesuffix(lib, ".so") in known_libraries:
-					skip = True
-
-				if skip:
+		self.files: List[Tuple[Path, FileEntry]] = []
+		"""Proprietary files prefix of the partition and file entry of each file"""
+
+	def add_matched_files(
+		self,
+		matched: List[FileEntry],
+		partition: AndroidPartition,
+		shared_lib_index: SharedLibIndex,
+		owners: MutableSequence[int],
+		owner: int,
+	):
+		"""
+		Add the files already known to belong to this section,
+		along with the shared libs they need that are still UNOWNED.
+
+		owners maps each file ID to the index of the section owning it,
+		the added files get marked as owned by owner.
+		"""
+		with profiler.span(self.name, "section", partition=partition.model.name):
+			for file in matched:
+				owners[file.id] = owner
+			shared_lib_index.unowned_libs -= sum(1 for _ in get_shared_libs(matched))
+
+			self.files.extend((partition.model.proprietary_files_prefix, file) for file in matched)
+
+			# Handle shared libs, recursively adding the shared libs' shared libs as well
+			elfs = list(matched)
+
+			# Stop once no shared lib is left to claim, without reading any more ELFs
+			# (e.g. for the Miscellaneous section, which owns all the remaining files)
+			while elfs and shared_lib_index.unowned_libs:
+				file = elfs.pop()
+				# Check only ELFs
+				if file.top not in ELF_FOLDERS:
 					continue
 
-				# Recursively handle shared libs' shared libs as well
-				unmatched_shared_libs = get_shared_libs(not_matched)
-				for file in unmatched_shared_libs:
-					if file.name != lib:
+				# Add shared libs used by the section ELFs
+				for lib in shared_lib_index.get_needed_libs(file):
+					# Skip the lib if it belongs to another section
+					if is_known_interface_lib(lib):
 						continue
 
-					# Move from unmatched to matched
-					not_matched.remove(file)
-					matched.append(file)
+					if removesuffix(lib, ".so") in known_libraries:
+						continue
 
-		self.files.extend(
-			partition.model.proprietary_files_prefix / file.relative_to(partition.path)
-			for file in matched
-		)
+					for lib_file in shared_lib_index.get_libs(lib):
+						if owners[lib_file.id] != UNOWNED:
+							continue
 
-		return not_matched
+						owners[lib_file.id] = owner
+						self.files.append((partition.model.proprietary_files_prefix, lib_file))
+						elfs.append(lib_file)
+						shared_lib_index.unowned_libs -= 1
 
-	def get_files(self):
+	def get_files(self) -> List[Path]:
 		"""Returns the ordered list of files."""
-		self.files.sort(key=strcoll_files_key)
-		return self.files
-
-	def file_match(self, file: Path):
-		if self.name == "Miscellaneous":
-			return True
-
-		# Interfaces
-		for interface in self.interfaces:
-			# Service binary (we try)
-			if is_relative_to(file, "bin") and interface in file.name:
-				return True
-
-			# Service init script (we try)
-			if is_relative_to(file, "etc/init") and interface in file.name:
-				return True
-
-			# VINTF fragment (again, we try)
-			if is_relative_to(file, "etc/vintf/manifest") and interface in file.name:
-				return True
-
-			# Passthrough impl (only HIDL)
-			if (is_relative_to(file, "lib/hw") or is_relative_to(file, "lib64/hw")) and match(fr"{interface}@[0-9]+\\.[0-9]+-impl\\.so", file.name):
-				return True
-
-			# Interface libs (AIDL and HIDL)
-			if (is_relative_to(file, "lib") or is_relative_to(file, "lib64")) and match(fr"{interface}(@[0-9]+\\.[0-9]+|-).*\\.so", file.name):
-				return True
-
-		# Hardware modules
-		if is_relative_to(file, "lib/hw") or is_relative_to(file, "lib64/hw"):
-			for hardware_module in self.hardware_modules:
-				if file.name.startswith(f"{hardware_module}.") and file.suffix == ".so":
-					return True
-
-		# APEXes
-		if is_relative_to(file, "apex") and file.suffix == ".apex" and file.stem in self.apexes:
-			return True
-
-		# Apps
-		if is_relative_to(file, "app") or is_relative_to(file, "priv-app"):
-			if file.suffix == ".apk" and file.stem in self.apps:
-				return True
-
-		# Binaries
-		if is_relative_to(file, "bin") and file.name in self.binaries:
-			return True
-
-		# Init scripts
-		if is_relative_to(file, "etc/init"):
-			for binary in self.binaries:
-				if match(fr"(init)?(.)?{binary}\\.rc", file.name):
-					return True
-
-		# Libraries
-		if is_relative_to(file, "lib/") or is_relative_to(file, "lib64/"):
-			if file.suffix == ".so" and file.stem in self.libraries:
-				return True
-
-		# Filenames
-		if file.name in self.filenames:
-			return True
-
-		# Folders
-		for folder in [str(folder) for folder in file.parents]:
-			if folder in self.folders:
-				return True
-
-		# Patterns
-		if [pattern for pattern in self.patterns if match(pattern, str(file))]:
-			return True
-
-		return False
+		files = [prefix / file.path for prefix, file in self.files]
+		files.sort(key=strcoll_files_key)
+		return files
 
 	def property_match(self, prop: str):
 		"""Check if the property matches the prefixes."""
@@ -184,19 +125,38 @@ class Section:
 		return False
 
 sections: List[Section] = []
+classifier = SectionClassifier()
 known_interfaces: List[str] = []
-known_libraries: List[str] = []
+known_libraries: Set[str] = set()
+
+_known_interfaces_libs_pattern: Optional[Pattern] = None
+
+def is_known_interface_lib(lib: str) -> bool:
+	"""Check if a shared lib is an interface lib of any registered section."""
+	global _known_interfaces_libs_pattern
+
+	if _known_interfaces_libs_pattern is None:
+		if not known_interfaces:
+			return False
+
+		_known_interfaces_libs_pattern = compile_alternation(known_interfaces, INTERFACE_LIB_PATTERN)
+
+	return _known_interfaces_libs_pattern.match(lib) is not None
 
 def register_section(section: Type[Section]):
+	global _known_interfaces_libs_pattern
+
 	sections.append(section())
+	classifier.add_section(sections[-1])
 
 	for interface in section.interfaces:
 		assert interface not in known_interfaces, f"Duplicate interface: {interface}"
 		known_interfaces.append(interface)
+		_known_interfaces_libs_pattern = None
 
 	for library in section.libraries:
 		assert library not in known_libraries, f"Duplicate shared library: {library}"
-		known_libraries.append(library)
+		known_libraries.add(library)
 
 def register_sections(sections_path: Path):
 	"""Import all the sections and let them execute register_section()."""
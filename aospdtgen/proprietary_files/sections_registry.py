@@ -0,0 +1,998 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+# Generated by python3 -m aospdtgen.proprietary_files.generate_registry, do not edit.
+#
+
+REGISTRY_VERSION = 1
+
+SOURCES_HASH = '7e25e86295a77b61da1c98928976205148a451ee7372b455038b34f2ce703c41'
+
+SECTIONS = [
+	('AcdbSection', {
+		'name': 'ACDB',
+		'folders': ['etc/acdbdata'],
+	}),
+	('AdspSection', {
+		'name': 'ADSP',
+		'interfaces': ['vendor.qti.adsprpc'],
+		'binaries': ['adsprpcd'],
+		'libraries': ['libadsprpc', 'libadsp_default_listener'],
+	}),
+	('AdspModulesSection', {
+		'name': 'ADSP modules',
+		'folders': ['lib/rfs/dsp', 'lib/rfsa/adsp', 'lib64/rfs/dsp', 'lib64/rfsa/adsp'],
+	}),
+	('AlarmSection', {
+		'name': 'Alarm',
+		'interfaces': ['vendor.qti.hardware.alarm'],
+		'apps': ['PowerOffAlarm'],
+		'binaries': ['power_off_alarm', 'poweroffm64'],
+	}),
+	('AntSection', {
+		'name': 'ANT',
+		'interfaces': ['com.dsi.ant', 'com.qualcomm.qti.ant', 'vendor.xiaomi.hardware.antdtx'],
+	}),
+	('AntFirmwareSection', {
+		'name': 'ANT firmware',
+		'patterns': ['(.*/)?firmware/antdtx\\..*'],
+	}),
+	('AtraceSection', {
+		'name': 'Atrace',
+		'interfaces': ['android.hardware.atrace'],
+	}),
+	('AudioSection', {
+		'name': 'Audio',
+		'interfaces': ['android.hardware.audio',
+		'android.hardware.audio.common',
+		'android.hardware.audio.effect',
+		'vendor.mediatek.hardware.audio',
+		'vendor.oplus.hardware.binaural_record',
+		'vendor.oplus.hardware.virtual_device.audio',
+		'vendor.qti.hardware.audiohalext'],
+		'hardware_modules': ['audio.binaural_record', 'audio.primary', 'audio.r_submix', 'audio.usb', 'audio.virtual'],
+		'properties_prefixes': {'aaudio.': False,
+		'af.fast_track_multiplier': True,
+		'audio.': False,
+		'persist.audio.': False,
+		'persist.vendor.audio.': False,
+		'ro.audio.': False,
+		'ro.qc.sdk.audio.': False,
+		'ro.vendor.audio.': False,
+		'tunnel.audio.': False,
+		'use.voice.path.for.pcm.voip': True,
+		'vendor.audio.': False,
+		'vendor.audio_hal.': False,
+		'vendor.voice.path.for.pcm.voip': True},
+	}),
+	('AudioFxModulesSection', {
+		'name': 'Audio (FX modules)',
+		'folders': ['lib/soundfx', 'lib64/soundfx'],
+	}),
+	('AudioConfigsSection', {
+		'name': 'Audio configs',
+		'filenames': ['audio_io_policy.conf', 'audio_tuning_mixer.txt', 'default_volume_tables.xml'],
+		'folders': ['etc/audio'],
+		'patterns': ['etc/audio_configs.*\\.xml',
+		'etc/audio_effects.*\\.(conf|xml)',
+		'etc/audio_platform_info.*\\.xml',
+		'etc/.*audio_policy.*\\.xml',
+		'etc/mixer_paths.*\\.xml',
+		'etc/sound_trigger_.*\\.xml'],
+	}),
+	('AudioCalibrationSection', {
+		'name': 'Audio calibration',
+		'folders': ['etc/audio_param', 'etc/lvacfs_params', 'etc/smartpa_param', 'etc/spatializer'],
+		'patterns': ['(.*/)?firmware/tfa98xx\\..*'],
+	}),
+	('AuthsecretSection', {
+		'name': 'Authsecret',
+		'interfaces': ['android.hardware.authsecret'],
+	}),
+	('AutomotiveSection', {
+		'name': 'Automotive',
+		'interfaces': ['android.hardware.automotive.audiocontrol',
+		'android.hardware.automotive.can',
+		'android.hardware.automotive.evs',
+		'android.hardware.automotive.occupant_awareness',
+		'android.hardware.automotive.sv',
+		'android.hardware.automotive.vehicle',
+		'vendor.qti.hardware.automotive.vehicle'],
+	}),
+	('BluetoothSection', {
+		'name': 'Bluetooth',
+		'interfaces': ['android.hardware.bluetooth'],
+		'hardware_modules': ['bluetooth'],
+		'libraries': ['libbt-vendor'],
+		'properties_prefixes': {'bluetooth.': False,
+		'persist.bluetooth.': False,
+		'persist.sys.btsatck.': False,
+		'persist.vendor.bt.': False,
+		'persist.vendor.btsatck.': False,
+		'persist.vendor.btstack.': False,
+		'persist.vendor.qcom.bluetooth.': False,
+		'ro.bluetooth.': False,
+		'ro.vendor.bluetooth.': False,
+		'vendor.bluetooth.': False,
+		'vendor.qcom.bluetooth.': False},
+	}),
+	('BluetoothA2dpSection', {
+		'name': 'Bluetooth (A2DP)',
+		'interfaces': ['android.hardware.bluetooth.a2dp',
+		'android.hardware.bluetooth.audio',
+		'com.qualcomm.qti.bluetooth_audio',
+		'vendor.mediatek.hardware.bluetooth.audio',
+		'vendor.qti.hardware.bluetooth.audio',
+		'vendor.qti.hardware.bluetooth_audio',
+		'vendor.qti.hardware.bluetooth_sar',
+		'vendor.qti.hardware.btconfigstore'],
+		'hardware_modules': ['audio.bluetooth', 'audio.bluetooth_qti'],
+	}),
+	('BootSection', {
+		'name': 'Boot',
+		'interfaces': ['android.hardware.boot'],
+	}),
+	('BroadcastRadioSection', {
+		'name': 'Broadcast radio',
+		'interfaces': ['android.hardware.broadcastradio'],
+	}),
+	('CameraSection', {
+		'name': 'Camera',
+		'interfaces': ['android.hardware.camera.common',
+		'android.hardware.camera.device',
+		'android.hardware.camera.metadata',
+		'android.hardware.camera.provider',
+		'camera.device',
+		'motorola.hardware.camera.imgtuner',
+		'vendor.mediatek.hardware.camera.atms',
+		'vendor.mediatek.hardware.camera.bgservice',
+		'vendor.mediatek.hardware.camera.device',
+		'vendor.mediatek.hardware.camera.frhandler',
+		'vendor.mediatek.hardware.camera.isphal',
+		'vendor.mediatek.hardware.camera.lomoeffect',
+		'vendor.mediatek.hardware.camera.postproc',
+		'vendor.mediatek.hardware.camera.security',
+		'vendor.oplus.hardware.camera_rfi',
+		'vendor.oplus.hardware.cammidasservice',
+		'vendor.oplus.hardware.extcamera',
+		'vendor.oplus.hardware.virtual_device.camera.hal',
+		'vendor.oplus.hardware.virtual_device.camera.manager',
+		'vendor.oplus.hardware.virtual_device.camera.provider',
+		'vendor.qti.camera.provider',
+		'vendor.qti.hardware.camera.device',
+		'vendor.qti.hardware.camera.offlinecamera',
+		'vendor.qti.hardware.camera.postproc',
+		'vendor.qti.hardware.scve.objecttracker',
+		'vendor.qti.hardware.scve.panorama',
+		'vendor.qti.hardware.seccam'],
+		'hardware_modules': ['camera', 'com.qti.chi'],
+		'binaries': ['camerahalserver', 'mm-qcamera-daemon', 'virtualcameraprovider'],
+		'libraries': ['libscveBlobDescriptor_stub',
+		'libscveCommon',
+		'libscveCommon_stub',
+		'libscveObjectSegmentation',
+		'libscveObjectSegmentation_stub',
+		'libscveObjectTracker',
+		'libscveObjectTracker_stub',
+		'libscvePanorama',
+		'libscvePanorama_lite',
+		'libscvePanorama_stub'],
+		'folders': ['lib/camera', 'lib64/camera'],
+		'patterns': ['lib(64)?/com.qti.feature2\\..*\\.so',
+		'lib(64)?/libCamera_.*\\.so',
+		'lib(64)?/libactuator_.*\\.so',
+		'lib(64)?/libarcsoft_.*\\.so',
+		'lib(64)?/libcamx.*\\.so',
+		'lib(64)?/libchromatix_.*\\.so',
+		'lib(64)?/libmmcamera_.*\\.so',
+		'lib(64)?/libmmcamera2_.*\\.so',
+		'lib(64)?/libmtkcam_.*\\.so',
+		'lib(64)?/libois_.*\\.so'],
+		'properties_prefixes': {'camera.': False, 'persist.vendor.camera.': False, 'vendor.camera.': False},
+	}),
+	('CameraConfigsSection', {
+		'name': 'Camera configs',
+		'folders': ['camera', 'etc/camera'],
+	}),
+	('CameraFirmwareSection', {
+		'name': 'Camera firmware',
+		'patterns': ['(.*/)?firmware/CAMERA_ICP.*',
+		'bin/lib3a.*',
+		'bin/libccu_.*',
+		'firmware/lib3a.*',
+		'firmware/libccu_.*'],
+	}),
+	('CameraMotorSection', {
+		'name': 'Camera motor',
+		'interfaces': ['vendor.xiaomi.hardware.motor'],
+		'libraries': ['mi.motor.daemon'],
+		'folders': ['etc/step_motor'],
+		'patterns': ['lib(64)?/libmivendor_module_.*\\.so'],
+	}),
+	('CasSection', {
+		'name': 'CAS',
+		'interfaces': ['android.hardware.cas', 'android.hardware.cas.native'],
+	}),
+	('CdspSection', {
+		'name': 'CDSP',
+		'interfaces': ['vendor.qti.cdsprpc'],
+		'binaries': ['cdsprpcd'],
+		'libraries': ['libcdsprpc', 'libcdsp_default_listener', 'libfastcvdsp_stub', 'libfastcvopt'],
+	}),
+	('CitSection', {
+		'name': 'CIT',
+		'interfaces': ['vendor.xiaomi.cit.bluetooth',
+		'vendor.xiaomi.cit.wifi',
+		'vendor.xiaomi.hardware.citsensorservice',
+		'vendor.xiaomi.hardware.citvendorservice'],
+	}),
+	('CneSection', {
+		'name': 'CNE',
+		'interfaces': ['com.quicinc.cne.api',
+		'com.quicinc.cne.constants',
+		'com.quicinc.cne.server',
+		'vendor.qti.data.factory',
+		'vendor.qti.data.mwqem',
+		'vendor.qti.data.slm',
+		'vendor.qti.hardware.cacert',
+		'vendor.qti.hardware.data.cne.internal.api',
+		'vendor.qti.hardware.data.cne.internal.constants',
+		'vendor.qti.hardware.data.cne.internal.server',
+		'vendor.qti.hardware.data.connection',
+		'vendor.qti.hardware.data.connectionaidl',
+		'vendor.qti.hardware.data.connectionfactory',
+		'vendor.qti.hardware.data.dataactivity',
+		'vendor.qti.hardware.data.dynamicdds',
+		'vendor.qti.hardware.data.flow',
+		'vendor.qti.hardware.data.iwlan',
+		'vendor.qti.hardware.data.iwlandata',
+		'vendor.qti.hardware.data.ka',
+		'vendor.qti.hardware.data.latency',
+		'vendor.qti.hardware.data.lce',
+		'vendor.qti.hardware.data.qmi',
+		'vendor.qti.hardware.factory',
+		'vendor.qti.hardware.mwqemadapter',
+		'vendor.qti.hardware.slmadapter',
+		'vendor.qti.latency'],
+		'apps': ['CneApp'],
+		'binaries': ['cnd'],
+		'folders': ['etc/cne'],
+		'properties_prefixes': {'persist.vendor.cne.': False},
+	}),
+	('ConfigstoreSection', {
+		'name': 'Configstore',
+		'interfaces': ['android.hardware.configstore', 'vendor.qti.hardware.capabilityconfigstore'],
+		'folders': ['etc/configstore'],
+	}),
+	('ConfirmationUISection', {
+		'name': 'Confirmation UI',
+		'interfaces': ['android.hardware.confirmationui'],
+	}),
+	('ContextHubSection', {
+		'name': 'Context hub',
+		'interfaces': ['android.hardware.contexthub'],
+	}),
+	('CvpSection', {
+		'name': 'CVP',
+		'interfaces': ['vendor.qti.hardware.cvp'],
+	}),
+	('CvpFirmwareSection', {
+		'name': 'CVP firmware',
+		'patterns': ['(.*/)?firmware/evass\\..*', '(.*/)?firmware/evass-lt\\..*'],
+	}),
+	('DisplaySection', {
+		'name': 'Display',
+		'interfaces': ['android.hardware.graphics.allocator',
+		'android.hardware.graphics.bufferqueue',
+		'android.hardware.graphics.common',
+		'android.hardware.graphics.composer',
+		'android.hardware.graphics.composer3',
+		'android.hardware.graphics.mapper',
+		'android.hardware.memtrack',
+		'com.motorola.hardware.display.panel',
+		'com.motorola.hardware.display.touch',
+		'vendor.display.color',
+		'vendor.display.config',
+		'vendor.display.postproc',
+		'vendor.mediatek.hardware.composer_ext',
+		'vendor.mediatek.hardware.dfps',
+		'vendor.mediatek.hardware.mms',
+		'vendor.mediatek.hardware.pq',
+		'vendor.oplus.hardware.displaycolorfeature',
+		'vendor.oplus.hardware.displaypanelfeature',
+		'vendor.qti.hardware.display.allocator',
+		'vendor.qti.hardware.display.color',
+		'vendor.qti.hardware.display.composer',
+		'vendor.qti.hardware.display.config',
+		'vendor.qti.hardware.display.mapper',
+		'vendor.qti.hardware.display.mapperextensions',
+		'vendor.qti.hardware.display.postproc',
+		'vendor.qti.hardware.qdutils_disp',
+		'vendor.xiaomi.hardware.displayfeature'],
+		'hardware_modules': ['copybit', 'displayfeature', 'displaypanel', 'gralloc', 'hwcomposer', 'memtrack', 'vulkan'],
+		'libraries': ['libsdedrm', 'libsdm-color', 'libsdm-diag', 'libsdmextension'],
+		'folders': ['lib/egl', 'lib64/egl'],
+		'properties_prefixes': {'debug.egl.': False,
+		'debug.sf.': False,
+		'persist.displayfeature.': False,
+		'persist.sys.sf.': False,
+		'persist.vendor.dc_backlight.': False,
+		'persist.vendor.dfps.': False,
+		'ro.gfx.driver.': False,
+		'ro.hardware.egl': True,
+		'ro.hardware.vulkan': True,
+		'ro.hwui.': False,
+		'ro.opengles.': False,
+		'ro.surface_flinger.': False,
+		'ro.vendor.cabc.': False,
+		'ro.vendor.colorpick_adjust': True,
+		'ro.vendor.dfps.': False,
+		'ro.vendor.display.': False,
+		'ro.vendor.fps.': False,
+		'ro.vendor.hbm_backlight.': False,
+		'ro.vendor.histogram.': False,
+		'ro.vendor.mi_sf.': False,
+		'ro.vendor.whitepoint_calibration_enable': True,
+		'vendor.display.': False,
+		'vendor.gralloc.': False},
+	}),
+	('DisplayPixelworksSection', {
+		'name': 'Display (Pixelworks)',
+		'interfaces': ['vendor.pixelworks.hardware.display',
+		'vendor.pixelworks.hardware.display.iris',
+		'vendor.pixelworks.hardware.feature',
+		'vendor.pixelworks.hardware.feature.irisfeature'],
+		'patterns': ['(.*/)?firmware/pxlw_.*\\..*'],
+	}),
+	('DisplayConfigsSection', {
+		'name': 'Display configs',
+		'folders': ['etc/display', 'etc/inparm'],
+		'patterns': ['etc/ltm_*', 'etc/mdss_*', 'etc/qdcm_*'],
+	}),
+	('DisplayFirmwareSection', {
+		'name': 'Display firmware',
+		'folders': ['gpu/kbc'],
+		'patterns': ['(.*/)?firmware/a[0-9]+_.*\\..*', '(.*/)?firmware/iris.*\\..*'],
+	}),
+	('DpmSection', {
+		'name': 'DPM',
+		'interfaces': ['com.qualcomm.qti.dpm.api',
+		'vendor.qti.diaghal',
+		'vendor.qti.hardware.dpmaidlservice',
+		'vendor.qti.hardware.dpmservice'],
+		'binaries': ['dpmQmiMgr', 'dpmd'],
+		'folders': ['etc/dpm'],
+		'properties_prefixes': {'persist.vendor.dpm.': False, 'persist.vendor.dpmhalservice.': False},
+	}),
+	('DrmSection', {
+		'name': 'DRM',
+		'interfaces': ['android.hardware.drm', 'vendor.mediatek.hardware.keymanage'],
+		'apexes': ['com.google.android.widevine.nonupdatable'],
+		'libraries': ['liboemcrypto'],
+		'folders': ['lib/mediacas', 'lib/mediadrm', 'lib/mtkdrm', 'lib64/mediacas', 'lib64/mediadrm', 'lib64/mtkdrm'],
+		'properties_prefixes': {'drm.service.enabled': True, 'ro.netflix.bsp_rev': True},
+	}),
+	('DrmQseeSection', {
+		'name': 'DRM (Qualcomm Secure Execution Environment)',
+		'interfaces': ['vendor.qti.hardware.qseecom'],
+		'binaries': ['qseecomd'],
+		'libraries': ['libQSEEComAPI'],
+	}),
+	('DrmQteeSection', {
+		'name': 'DRM (Qualcomm Trusted Execution Environment)',
+		'interfaces': ['vendor.qti.hardware.qteeconnector'],
+		'libraries': ['libGPQTEEC_vendor', 'libGPTEE_vendor', 'libQTEEConnector_vendor'],
+	}),
+	('DrmFirmwareSection', {
+		'name': 'DRM firmware',
+		'folders': ['etc/firmware/drm'],
+		'patterns': ['(.*/)?firmware/widevine\\..*'],
+	}),
+	('DspSection', {
+		'name': 'DSP',
+		'interfaces': ['vendor.qti.hardware.dsp'],
+		'binaries': ['dspservice'],
+		'filenames': ['vendor.qti.hardware.dsp.policy'],
+	}),
+	('DumpstateSection', {
+		'name': 'Dumpstate',
+		'interfaces': ['android.hardware.dumpstate'],
+	}),
+	('FaceSection', {
+		'name': 'Face',
+		'interfaces': ['android.hardware.biometrics.face', 'vendor.oplus.hardware.biometrics.face'],
+	}),
+	('FastbootSection', {
+		'name': 'Fastboot',
+		'interfaces': ['android.hardware.fastboot'],
+	}),
+	('FingerprintSection', {
+		'name': 'Fingerprint',
+		'interfaces': ['android.hardware.biometrics.fingerprint',
+		'vendor.goodix.hardware.biometrics.fingerprint',
+		'vendor.oplus.hardware.biometrics.fingerprint',
+		'vendor.qti.hardware.fingerprint',
+		'vendor.xiaomi.hardware.fingerprintextension'],
+		'hardware_modules': ['fingerprint', 'gf_fingerprint'],
+		'binaries': ['qfp-daemon'],
+		'properties_prefixes': {'persist.vendor.qfp': True},
+	}),
+	('FmSection', {
+		'name': 'FM',
+		'interfaces': ['vendor.qti.hardware.fm'],
+	}),
+	('GatekeeperSection', {
+		'name': 'Gatekeeper',
+		'interfaces': ['android.hardware.gatekeeper',
+		'vendor.microtrust.hardware.thh',
+		'vendor.qti.hardware.secureprocessor',
+		'vendor.qti.spu',
+		'vendor.trustonic.tee'],
+		'hardware_modules': ['gatekeeper', 'libSoftGatekeeper'],
+		'binaries': ['teei_daemon'],
+		'patterns': ['etc/init/microtrust.*\\.rc'],
+		'properties_prefixes': {'vendor.gatekeeper.': False},
+	}),
+	('GatekeeperConfigsSection', {
+		'name': 'Gatekeeper configs',
+		'folders': ['thh'],
+	}),
+	('GnssSection', {
+		'name': 'GNSS',
+		'interfaces': ['android.hardware.gnss',
+		'android.hardware.gnss.measurement_corrections',
+		'android.hardware.gnss.visibility_control',
+		'vendor.qti.gnss'],
+		'hardware_modules': ['gps'],
+		'binaries': ['loc_launcher',
+		'lowi-server',
+		'mnld',
+		'mtk_agpsd',
+		'slim_daemon',
+		'xtra-daemon',
+		'xtwifi-client',
+		'xtwifi-inet-agent'],
+		'patterns': ['etc/init/mtk_agps.*\\.rc'],
+		'properties_prefixes': {'persist.sys.gps.': False, 'persist.vendor.overlay.izat.': False},
+	}),
+	('GnssConfigsSection', {
+		'name': 'GNSS configs',
+		'filenames': ['apdr.conf', 'flp.conf', 'gps.conf', 'izat.conf', 'lowi.conf', 'sap.conf', 'xtwifi.conf'],
+		'folders': ['etc/gnss'],
+	}),
+	('HealthSection', {
+		'name': 'Health',
+		'interfaces': ['android.hardware.health',
+		'android.hardware.health.storage',
+		'motorola.hardware.health',
+		'motorola.hardware.health.storage',
+		'motorola.hardware.wireless.wlc',
+		'vendor.oplus.hardware.charger',
+		'vendor-oplus-hardware-charger',
+		'vendor.qti.hardware.charger_monitor',
+		'vendor.xiaomi.hardware.micharge'],
+		'binaries': ['batterysecret', 'fuelgauged', 'hvdcp_opti', 'init.qti.chg_policy.sh', 'wlschgd'],
+		'filenames': ['charger_fstab.qti', 'fuelgauged_init.rc'],
+		'properties_prefixes': {'ro.charger.': False},
+	}),
+	('HealthFirmwareSection', {
+		'name': 'Health firmware',
+		'folders': ['firmware/fastchg'],
+	}),
+	('IdentitySection', {
+		'name': 'Identity',
+		'interfaces': ['android.hardware.identity'],
+	}),
+	('InputSection', {
+		'name': 'Input',
+		'interfaces': ['android.hardware.input.classifier',
+		'android.hardware.input.common',
+		'android.hardware.input.processor'],
+	}),
+	('InputMotorolaSection', {
+		'name': 'Input (Motorola)',
+		'interfaces': ['motorola.hardware.input'],
+	}),
+	('IpaSection', {
+		'name': 'IPA',
+		'binaries': ['ipacm', 'ipacm-diag'],
+		'libraries': ['libipanat', 'liboffloadhal'],
+		'filenames': ['IPACM_cfg.xml'],
+	}),
+	('IpaFirmwareSection', {
+		'name': 'IPA firmware',
+		'filenames': ['ipa_fws.rc'],
+		'patterns': ['(.*/)?firmware/.*ipa_(fws|uc)*.'],
+	}),
+	('IrSection', {
+		'name': 'IR',
+		'interfaces': ['android.hardware.ir'],
+		'hardware_modules': ['consumerir'],
+	}),
+	('KeymasterSection', {
+		'name': 'Keymaster',
+		'interfaces': ['android.hardware.keymaster', 'vendor.mediatek.hardware.keymaster_attestation'],
+		'hardware_modules': ['keystore', 'kmsetkey'],
+		'binaries': ['bp_kmsetkey_ca'],
+	}),
+	('LightSection', {
+		'name': 'Light',
+		'interfaces': ['android.hardware.light'],
+		'hardware_modules': ['lights'],
+	}),
+	('LocalTimeSection', {
+		'name': 'Local time',
+		'hardware_modules': ['local_time'],
+	}),
+	('MediaSection', {
+		'name': 'Media',
+		'interfaces': ['android.hardware.media',
+		'android.hardware.media.bufferpool',
+		'android.hardware.media.c2',
+		'android.hardware.media.omx',
+		'vendor.qti.hardware.qconfig',
+		'vendor.qti.hardware.vpp',
+		'vendor.qti.media.c2'],
+		'binaries': ['qconfigservice', 'vppservice', 'vpud'],
+		'filenames': ['c2_manifest_vendor.xml', 'mediacodec.policy'],
+		'patterns': ['etc/seccomp_policy/codec2.vendor.*.-arm\\.policy',
+		'lib(64)?/libMtkOmx.*\\.so',
+		'lib(64)?/libOmx.*\\.so',
+		'lib(64)?/libstagefright.*\\.so'],
+		'properties_prefixes': {'debug.stagefright.': False, 'media.': False},
+	}),
+	('MediaDolbySection', {
+		'name': 'Media (Dolby)',
+		'interfaces': ['vendor.dolby.dms',
+		'vendor.dolby.hardware.dms',
+		'vendor.dolby.media.c2',
+		'vendor.dolby_sp.hardware.dmssp',
+		'vendor.dolby_sp.media.c2'],
+		'libraries': ['libdapparamstorage', 'libdeccfg'],
+		'filenames': ['dolby_vision.cfg'],
+		'folders': ['etc/dolby'],
+		'patterns': ['lib(64)?/libdolby.*\\.so'],
+		'properties_prefixes': {'ro.vendor.dolby.': False},
+	}),
+	('MediaOZOAudioSection', {
+		'name': 'Media (OZO Audio)',
+		'interfaces': ['vendor.ozoaudio.media.c2'],
+	}),
+	('MediaConfigsSection', {
+		'name': 'Media configs',
+		'patterns': ['etc/media_codecs.*\\.xml', 'etc/media_profiles.*\\.xml'],
+	}),
+	('NeuralNetworksSection', {
+		'name': 'Neural networks',
+		'interfaces': ['android.hardware.neuralnetworks', 'vendor.mediatek.hardware.mmagent'],
+		'binaries': ['nn_device_test', 'npu_launcher'],
+		'libraries': ['libhexagon_nn_stub'],
+		'patterns': ['lib(64)?/libhta(_.*.)?\\.so', 'lib(64)?/unnhal.*.\\.so'],
+	}),
+	('NfcSection', {
+		'name': 'NFC',
+		'interfaces': ['android.hardware.nfc',
+		'vendor.nxp.hardware.nfc',
+		'vendor.oplus.hardware.nfcExtns',
+		'vendor.oplus.hardware.nfc_aidl'],
+		'hardware_modules': ['nfc'],
+		'properties_prefixes': {'ro.nfc.': False},
+	}),
+	('NfcConfigsSection', {
+		'name': 'NFC configs',
+		'folders': ['etc/nfc'],
+		'patterns': ['etc/libnfc-.*\\.conf', 'etc/sn100u_.*\\.pnscr'],
+	}),
+	('NVRAMSection', {
+		'name': 'NVRAM',
+		'interfaces': ['vendor.mediatek.hardware.nvram'],
+		'binaries': ['fuelgauged_nvram', 'nvram_daemon'],
+		'filenames': ['fuelgauged_nvram_init.rc'],
+	}),
+	('OemLockSection', {
+		'name': 'OEM lock',
+		'interfaces': ['android.hardware.oemlock'],
+	}),
+	('PasrSection', {
+		'name': 'PASR',
+		'interfaces': ['vendor.qti.memory.pasrmanager', 'vendor.qti.power.pasrmanager'],
+		'apps': ['pasrservice'],
+	}),
+	('PaymentEIDSection', {
+		'name': 'Payment (eID)',
+		'interfaces': ['vendor.qti.hardware.eid'],
+	}),
+	('PaymentIFAASection', {
+		'name': 'Payment (IFAA)',
+		'interfaces': ['vendor.qti.hardware.ifaa'],
+		'apps': ['IFAAService'],
+	}),
+	('PaymentOplusSection', {
+		'name': 'Payment (oplus)',
+		'interfaces': ['vendor.oplus.hardware.biometrics.fingerprintpay',
+		'vendor.oplus.hardware.fido.fido2ca',
+		'vendor.oplus.hardware.fido.fidoca'],
+	}),
+	('PaymentXiaomiSection', {
+		'name': 'Payment (Xiaomi)',
+		'interfaces': ['vendor.fido.fidoca',
+		'vendor.xiaomi.hardware.mfidoca',
+		'vendor.xiaomi.hardware.mlipay',
+		'vendor.xiaomi.hardware.mtdservice',
+		'vendor.xiaomi.hardware.tidaservice'],
+		'patterns': ['bin/fidoca(@[0-9]+\\.[0-9]+)?$',
+		'bin/mlipayd(@[0-9]+\\.[0-9]+)?$',
+		'bin/mtd(@[0-9]+\\.[0-9]+)?$',
+		'bin/tidad(@[0-9]+\\.[0-9]+)?$'],
+	}),
+	('PaymentFirmwareSection', {
+		'name': 'Payment firmware',
+		'patterns': ['(.*/)?firmware/alipay\\..*', '(.*/)?firmware/fidoctap\\..*', '(.*/)?firmware/fidotap\\..*'],
+	}),
+	('PerfSection', {
+		'name': 'Perf',
+		'interfaces': ['vendor.qti.hardware.perf'],
+		'libraries': ['libqti-perfd-client'],
+		'filenames': ['powerhint.xml'],
+		'folders': ['etc/perf'],
+		'properties_prefixes': {'ro.vendor.extension_library': True},
+	}),
+	('PerfIopSection', {
+		'name': 'Perf IOP',
+		'interfaces': ['vendor.qti.hardware.iop'],
+		'libraries': ['libqti-iopd-client'],
+	}),
+	('PowerSection', {
+		'name': 'Power',
+		'interfaces': ['android.hardware.power',
+		'vendor-oplus-hardware-power-powermonitor',
+		'vendor.qti.hardware.power.powermodule',
+		'vendor.mediatek.hardware.mtkpower',
+		'vendor.mediatek.hardware.power'],
+		'hardware_modules': ['power'],
+		'properties_prefixes': {'vendor.power.': False},
+	}),
+	('PowerConfigsSection', {
+		'name': 'Power configs',
+		'folders': ['etc/pwr'],
+	}),
+	('QccSection', {
+		'name': 'QCC',
+		'interfaces': ['vendor.qti.hardware.qccsyshal', 'vendor.qti.hardware.qccvndhal', 'vendor.qti.qccvndhal_aidl'],
+		'binaries': ['qcc-vendor'],
+	}),
+	('QesdSection', {
+		'name': 'QESD',
+		'interfaces': ['vendor.qti.qesdhal', 'vendor.qti.qesdhalaidl', 'vendor.qti.qesdsys'],
+		'binaries': ['perf_qesdk_client', 'qesdk-manager', 'sensors-qesdk'],
+	}),
+	('QspmSection', {
+		'name': 'QSPM',
+		'interfaces': ['vendor.qti.qspmhal'],
+		'filenames': ['qspm.policy'],
+	}),
+	('QvrSection', {
+		'name': 'QVR',
+		'interfaces': ['vendor.qti.hardware.qvr'],
+		'binaries': ['qvrdatalogger', 'qvrservice', 'qvrservicetest', 'qvrservicetest64'],
+		'folders': ['etc/qvr'],
+	}),
+	('QxrSection', {
+		'name': 'QXR',
+		'interfaces': ['vendor.qti.hardware.qxr'],
+	}),
+	('RadioSection', {
+		'name': 'Radio',
+		'interfaces': ['android.hardware.radio',
+		'mtkfusionrild',
+		'qcrild',
+		'qcrilNrd',
+		'rild',
+		'vendor.mediatek.hardware.mtkradioex',
+		'vendor.mediatek.hardware.nwk_opt',
+		'vendor.mediatek.hardware.radio',
+		'vendor.oplus.hardware.appradioaidl',
+		'vendor.oplus.hardware.esim',
+		'vendor.oplus.hardware.radio',
+		'vendor.qti.hardware.embmssl',
+		'vendor.qti.hardware.embmsslaidl',
+		'vendor.qti.hardware.radio.am',
+		'vendor.qti.hardware.radio.atcmdfwd',
+		'vendor.qti.hardware.radio.common',
+		'vendor.qti.hardware.radio.internal.deviceinfo',
+		'vendor.qti.hardware.radio.lpa',
+		'vendor.qti.hardware.radio.qcrilhook',
+		'vendor.qti.hardware.radio.qtiradio',
+		'vendor.qti.hardware.radio.qtiradioconfig',
+		'vendor.qti.hardware.radio.uim',
+		'vendor.qti.hardware.radio.uim_remote_client',
+		'vendor.qti.hardware.radio.uim_remote_server',
+		'vendor.qti.rmt_storage',
+		'vendor.qti.tftp'],
+		'hardware_modules': ['radio'],
+		'apps': ['IWlanService', 'QtiTelephonyService', 'qcrilmsgtunnel'],
+		'binaries': ['ATFWD-daemon',
+		'adpl',
+		'ccci_mdinit',
+		'ccci_rpcd',
+		'gsm0710muxd',
+		'ks',
+		'mdm_helper',
+		'netmgrd',
+		'pd-mapper',
+		'port-bridge',
+		'qrtr-cfg',
+		'qrtr-lookup',
+		'qrtr-ns',
+		'qti',
+		'rmt_storage',
+		'ssgtzd',
+		'tftp_server',
+		'xcap'],
+		'filenames': ['init-qcril-data.rc', 'init.md_apps.rc'],
+		'folders': ['etc/qcril_database', 'radio/qcril_database'],
+		'patterns': ['etc/init/init.ccci.*\\.rc',
+		'etc/init/data.*.\\.rc',
+		'etc/seccomp_policy/atfwd(@[0-9]+\\.[0-9]+)?.policy'],
+		'properties_prefixes': {'persist.radio.': False,
+		'persist.rild.': False,
+		'persist.vendor.mdm_helper.': False,
+		'persist.vendor.radio.': False,
+		'ril.': False,
+		'rild.': False,
+		'ro.radio.': False,
+		'ro.telephony.': False,
+		'telephony.': False},
+	}),
+	('RadioImsSection', {
+		'name': 'Radio (IMS)',
+		'interfaces': ['com.qualcomm.qti.imscmservice',
+		'com.qualcomm.qti.uceservice',
+		'vendor.mediatek.hardware.rcs',
+		'vendor.mediatek.hardware.videotelephony',
+		'vendor.oplus.hardware.ims',
+		'vendor.qti.hardware.radio.ims',
+		'vendor.qti.ims.callcapability',
+		'vendor.qti.ims.callinfo',
+		'vendor.qti.ims.factory',
+		'vendor.qti.ims.rcsconfig',
+		'vendor.qti.imsrtpservice'],
+		'apps': ['ims'],
+		'binaries': ['bip',
+		'charon',
+		'epdg_wod',
+		'ims_rtp_daemon',
+		'imsdatadaemon',
+		'imsqmidaemon',
+		'imsrcsd',
+		'ipsec_mon',
+		'rcs_volte_stack',
+		'starter',
+		'stroke',
+		'volte_clientapi_ua',
+		'volte_imcb',
+		'volte_imsm_93',
+		'volte_md_status',
+		'volte_rcs_ua',
+		'volte_stack',
+		'volte_ua',
+		'vtservice_hidl'],
+		'libraries': ['lib-rcsconfig', 'lib-siputility', 'lib-uceservice'],
+		'filenames': ['imsrtp.policy', 'init.wod.rc'],
+		'patterns': ['lib(64)?/lib-ims.*.\\.so'],
+		'properties_prefixes': {'persist.vendor.ims.': False},
+	}),
+	('RebootEscrowSection', {
+		'name': 'Reboot escrow',
+		'interfaces': ['android.hardware.rebootescrow'],
+	}),
+	('RenderscriptSection', {
+		'name': 'RenderScript',
+		'interfaces': ['android.hardware.renderscript'],
+		'libraries': ['libRSDriver_adreno', 'librs_adreno', 'librs_adreno_sha1'],
+	}),
+	('SecureElementSection', {
+		'name': 'Secure element',
+		'interfaces': ['android.hardware.secure_element', 'vendor.qti.secure_element'],
+	}),
+	('SecureElementPowerManagerSection', {
+		'name': 'Secure element (power manager)',
+		'interfaces': ['vendor.qti.esepowermanager'],
+	}),
+	('SecuritySection', {
+		'name': 'Security',
+		'interfaces': ['android.hardware.security.keymint',
+		'android.hardware.security.rkp',
+		'android.hardware.security.secureclock',
+		'android.hardware.security.sharedsecret'],
+	}),
+	('SensorsSection', {
+		'name': 'Sensors',
+		'interfaces': ['android.hardware.sensors',
+		'motorola.hardware.sensorscalibrate',
+		'vendor-oplus-hardware-oplusSensor',
+		'vendor.qti.hardware.sensorscalibrate'],
+		'hardware_modules': ['sensors'],
+		'binaries': ['init.qcom.sensors.sh', 'sensors.qti', 'sscrpcd'],
+		'patterns': ['lib(64)?/sensors\\..*\\.so'],
+		'properties_prefixes': {'persist.vendor.sensor.': False, 'persist.vendor.sensors.': False},
+	}),
+	('SensorsConfigsSection', {
+		'name': 'Sensors configs',
+		'folders': ['etc/motorola/sensors', 'etc/sensor', 'etc/sensors'],
+	}),
+	('ServicetrackerSection', {
+		'name': 'Service tracker',
+		'interfaces': ['vendor.qti.hardware.servicetracker'],
+	}),
+	('SlaSection', {
+		'name': 'SLA',
+		'interfaces': ['vendor.qti.sla.service'],
+	}),
+	('SoterSection', {
+		'name': 'Soter',
+		'interfaces': ['vendor.microtrust.hardware.soter', 'vendor.qti.hardware.soter'],
+		'apps': ['SoterService'],
+	}),
+	('SoundtriggerSection', {
+		'name': 'Soundtrigger',
+		'interfaces': ['android.hardware.soundtrigger', 'android.hardware.soundtrigger3', 'vendor.qti.voiceprint'],
+		'hardware_modules': ['sound_trigger'],
+		'properties_prefixes': {'ro.vendor.audio.soundtrigger': False},
+	}),
+	('StorageFirmwareSection', {
+		'name': 'Storage firmware',
+		'folders': ['firmware/ufs'],
+	}),
+	('TetherOffloadSection', {
+		'name': 'Tether offload',
+		'interfaces': ['android.hardware.tetheroffload',
+		'android.hardware.tetheroffload.config',
+		'android.hardware.tetheroffload.control'],
+		'binaries': ['tetheroffloadservice'],
+	}),
+	('ThermalSection', {
+		'name': 'Thermal',
+		'interfaces': ['android.hardware.thermal'],
+		'hardware_modules': ['thermal'],
+		'properties_prefixes': {'vendor.sys.thermal.': False},
+	}),
+	('ThermalQcomSection', {
+		'name': 'Thermal (Qualcomm)',
+		'interfaces': ['vendor.qti.hardware.limits'],
+		'binaries': ['thermal-engine'],
+		'libraries': ['libthermalclient'],
+	}),
+	('ThermalXiaomiSection', {
+		'name': 'Thermal (Xiaomi)',
+		'binaries': ['mi_thermald'],
+	}),
+	('ThermalConfigsSection', {
+		'name': 'Thermal configs',
+		'folders': ['etc/temperature_profile'],
+		'patterns': ['etc/thermal.*.\\.conf'],
+	}),
+	('TimeSection', {
+		'name': 'Time services',
+		'apps': ['TimeService'],
+		'binaries': ['time_daemon'],
+		'libraries': ['libtime_genoff'],
+	}),
+	('TouchHbtpSection', {
+		'name': 'Touch (HBTP)',
+		'interfaces': ['vendor.qti.hardware.improvetouch.touchcompanion'],
+		'binaries': ['hbtp_daemon'],
+		'folders': ['etc/hbtp'],
+	}),
+	('TouchOplusSection', {
+		'name': 'Touch (oplus)',
+		'interfaces': ['vendor-oplus-hardware-touch'],
+	}),
+	('TouchXiaomiSection', {
+		'name': 'Touch (Xiaomi)',
+		'interfaces': ['vendor.xiaomi.hardware.touchfeature'],
+		'properties_prefixes': {'ro.vendor.touchfeature.': False},
+	}),
+	('TouchFirmwareSection', {
+		'name': 'Touch firmware',
+		'folders': ['firmware/tp'],
+	}),
+	('TrustedUiSection', {
+		'name': 'Trusted UI',
+		'interfaces': ['vendor.qti.hardware.trustedui', 'vendor.qti.hardware.tui_comm', 'vendor.trustonic.tee.tui'],
+		'binaries': ['TrustedUISampleTest'],
+		'libraries': ['libTrustedUI', 'libTrustedUIAIDL', 'libTrustedUITZ', 'libTrustedUIVM'],
+	}),
+	('TvSection', {
+		'name': 'TV',
+		'interfaces': ['android.hardware.tv.cec', 'android.hardware.tv.input', 'android.hardware.tv.tuner'],
+		'hardware_modules': ['tv_input'],
+	}),
+	('UsbSection', {
+		'name': 'USB',
+		'interfaces': ['android.hardware.usb'],
+		'properties_prefixes': {'vendor.usb.': False},
+	}),
+	('UwbSection', {
+		'name': 'UWB',
+		'interfaces': ['android.hardware.uwb', 'android.hardware.uwb.fira_android'],
+	}),
+	('VibratorSection', {
+		'name': 'Vibrator',
+		'interfaces': ['android.hardware.vibrator',
+		'motorola.hardware.vibrator',
+		'vendor.asus.vibrator.vibratorgovern',
+		'vendor.oplus.hardware.vibrator',
+		'vendor.qti.hardware.vibrator',
+		'vendor.xiaomi.hardware.vibratorfeature'],
+		'hardware_modules': ['vibrator'],
+	}),
+	('VibratorFirmwareSection', {
+		'name': 'Vibrator firmware',
+		'folders': ['etc/vibrator'],
+		'patterns': ['(.*/)?firmware/.*(rtp|RTP)\\.bin',
+		'(.*/)?firmware/aw8622x.*\\.bin',
+		'(.*/)?firmware/aw8697.*\\.bin'],
+	}),
+	('VrSection', {
+		'name': 'VR',
+		'interfaces': ['android.hardware.vr'],
+		'hardware_modules': ['vr'],
+	}),
+	('WeaverSection', {
+		'name': 'Weaver',
+		'interfaces': ['android.hardware.weaver'],
+	}),
+	('WifiSection', {
+		'name': 'Wi-Fi',
+		'interfaces': ['android.hardware.wifi',
+		'vendor.asus.wifi.netutil',
+		'vendor.asus.wifi.rttutil',
+		'vendor.ims.wifiantennamode',
+		'vendor.mediatek.hardware.wifi.hostapd',
+		'vendor.mediatek.hardware.wifi.supplicant',
+		'vendor.oplus.hardware.wifi',
+		'vendor.oplus.hardware.wifi-aidl',
+		'vendor.qti.hardware.fstman',
+		'vendor.qti.hardware.wifi.hostapd',
+		'vendor.qti.hardware.wifi.keystore',
+		'vendor.qti.hardware.wifi.supplicant',
+		'vendor.qti.hardware.wifi.wifilearner',
+		'vendor.qti.hardware.wigig.netperftuner',
+		'vendor.qti.hardware.wigig.supptunnel'],
+		'binaries': ['cnss-daemon',
+		'hostapd',
+		'hostapd_cli',
+		'wcnss_service',
+		'wlan_assistant',
+		'wmt_launcher',
+		'wmt_loader',
+		'wpa_cli',
+		'wpa_supplicant'],
+		'libraries': ['libwifi-hal-qcom'],
+		'filenames': ['init.wlan_drv.rc'],
+		'properties_prefixes': {'ro.hardware.wlan.': False, 'ro.wifi.': False, 'ro.wlan.': False, 'wifi.': False},
+	}),
+	('WifiConfigsSection', {
+		'name': 'Wi-Fi configs',
+		'folders': ['etc/wifi'],
+	}),
+	('WifiFirmwareSection', {
+		'name': 'Wi-Fi firmware',
+		'folders': ['firmware/wigig', 'firmware/wlan'],
+	}),
+	('WifiDisplaySection', {
+		'name': 'Wi-Fi Display',
+		'interfaces': ['com.qualcomm.qti.wifidisplayhal',
+		'vendor.qti.hardware.sigma_miracast',
+		'vendor.qti.hardware.wifidisplaysession'],
+		'apps': ['WfdService'],
+		'binaries': ['wfdhdcphalservice', 'wfdservice', 'wfdvndservice', 'wifidisplayhalservice'],
+		'libraries': ['libmiracast'],
+		'filenames': ['wfdconfig.xml', 'wifidisplayhalservice.policy'],
+		'patterns': ['etc/seccomp_policy/wfd.*.service\\.policy'],
+		'properties_prefixes': {'persist.debug.wfd.': False, 'persist.sys.wfd.': False},
+	}),
+]
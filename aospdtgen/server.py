@@ -0,0 +1,294 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from concurrent.futures import ThreadPoolExecutor
+from hmac import compare_digest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import JSONDecodeError, dumps, loads
+from os import environ, umask
+from pathlib import Path
+from secrets import token_urlsafe
+from sebaubuntu_libs.libexception import format_exception
+from sebaubuntu_libs.liblogging import LOGE, LOGI
+from signal import SIGTERM, default_int_handler, signal
+from socketserver import ThreadingMixIn, UnixStreamServer
+from threading import Lock
+from time import time
+from typing import Dict, List, Optional, Set
+
+from aospdtgen.batch import BatchEntry, get_jobs_per_worker, run_entry
+from aospdtgen.proprietary_files.elf_cache import ELFCache
+from aospdtgen.utils.output_folder import is_output_folder
+
+DEFAULT_SOCKET_PATH = Path(
+	environ.get("XDG_RUNTIME_DIR") or Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "aospdtgen"
+) / "aospdtgen.sock"
+"""Default Unix socket of the server, only accessible by its user"""
+
+TOKEN_ENV = "AOSPDTGEN_SERVER_TOKEN"
+"""Environment variable holding the token clients need to send over TCP"""
+
+MAX_FINISHED_JOBS = 1000
+"""How many finished jobs to remember the status of"""
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+class Job:
+	"""A device tree generation request and its status."""
+	def __init__(self, id: int, entry: BatchEntry, hardlink: bool = False, incremental: bool = False):
+		"""Initialize a queued job."""
+		self.id = id
+		self.entry = entry
+		self.hardlink = hardlink
+		self.incremental = incremental
+
+		self.status = JOB_QUEUED
+		self.error: Optional[str] = None
+		self.submitted = time()
+		self.started: Optional[float] = None
+		self.finished: Optional[float] = None
+
+	def to_dict(self) -> dict:
+		return {
+			"id": self.id,
+			"dump_path": str(self.entry.dump_path),
+			"output_path": str(self.entry.output_path),
+			"hardlink": self.hardlink,
+			"incremental": self.incremental,
+			"status": self.status,
+			"error": self.error,
+			"submitted": self.submitted,
+			"started": self.started,
+			"finished": self.finished,
+		}
+
+class DeviceTreeServer:
+	"""
+	Generate device trees on request, at most workers of them at the same time.
+
+	Everything compiled at import (sections, classifier, ignore rules, templates)
+	stays in memory between jobs, same goes for the ELF cache if it keeps its
+	entries in memory.
+	"""
+	def __init__(self, elf_cache: Optional[ELFCache] = None, workers: int = 1, jobs: int = 1):
+		"""Initialize the server, jobs is the number of processes used to parse ELFs."""
+		self.elf_cache = elf_cache
+		self.workers = workers
+		self.jobs = get_jobs_per_worker(workers, jobs)
+
+		self._jobs: Dict[int, Job] = {}
+		self._last_id = 0
+		self._lock = Lock()
+		self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+
+	def submit(self, entry: BatchEntry, hardlink: bool = False, incremental: bool = False) -> Job:
+		with self._lock:
+			self._last_id += 1
+			job = Job(self._last_id, entry, hardlink, incremental)
+			self._jobs[job.id] = job
+
+			self._forget_finished_jobs()
+
+		self._executor.submit(self._run, job)
+
+		return job
+
+	def get_job(self, id: int) -> Optional[Job]:
+		with self._lock:
+			return self._jobs.get(id)
+
+	def get_jobs(self) -> List[Job]:
+		with self._lock:
+			return list(self._jobs.values())
+
+	def shutdown(self):
+		"""Wait for the queued and running jobs to finish."""
+		self._executor.shutdown()
+
+	def _run(self, job: Job):
+		job.status = JOB_RUNNING
+		job.started = time()
+
+		# Anything going wrong must fail the job, else it stays running forever
+		error: Optional[str] = "Interrupted"
+		try:
+			# Clients can ask for any output path, never empty or prune a folder that isn't ours
+			if not is_output_folder(job.entry.output_path):
+				error = f"{job.entry.output_path} is not empty and isn't a device tree"
+				return
+
+			result = run_entry(job.entry, self.elf_cache, self.jobs, job.hardlink, job.incremental)
+			error = result.error
+
+			# Don't lose the parsed ELFs if the server gets killed
+			if self.elf_cache:
+				self.elf_cache.save()
+		except Exception as e:
+			LOGE(f"Job {job.id} failed:\n{format_exception(e)}")
+			error = format_exception(e)
+		finally:
+			job.error = error
+			job.finished = time()
+			job.status = JOB_FAILED if error else JOB_DONE
+
+	def _forget_finished_jobs(self):
+		finished = [
+			id for id, job in self._jobs.items()
+			if job.status in (JOB_DONE, JOB_FAILED)
+		]
+		for id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+			del self._jobs[id]
+
+class RequestHandler(BaseHTTPRequestHandler):
+	"""
+	JSON API of a DeviceTreeServer:
+	- POST /jobs with {"dump_path", "output_path", "hardlink", "incremental"} queues a job
+	- GET /jobs lists the jobs
+	- GET /jobs/<id> gets the status of a job
+	"""
+	device_tree_server: DeviceTreeServer
+	token: Optional[str] = None
+	"""Token to send as "Authorization: Bearer <token>", if any"""
+	hosts: Set[str] = set()
+	"""Accepted Host headers (to reject DNS rebinding), any if empty"""
+
+	def do_GET(self):
+		if not self._is_authorized():
+			return
+
+		parts = self.path.strip("/").split("/")
+
+		if parts == ["jobs"]:
+			self._send_json(200, [job.to_dict() for job in self.device_tree_server.get_jobs()])
+			return
+
+		if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+			job = self.device_tree_server.get_job(int(parts[1]))
+			if job:
+				self._send_json(200, job.to_dict())
+				return
+
+		self._send_json(404, {"error": "Not found"})
+
+	def do_POST(self):
+		if not self._is_authorized():
+			return
+
+		if self.path.strip("/") != "jobs":
+			self._send_json(404, {"error": "Not found"})
+			return
+
+		# Web pages can send text/plain POSTs to any origin without a CORS preflight
+		if self.headers.get_content_type() != "application/json":
+			self._send_json(415, {"error": "Content-Type must be application/json"})
+			return
+
+		try:
+			request = loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+			dump_path = Path(request["dump_path"])
+			output_path = Path(request["output_path"])
+			hardlink = bool(request.get("hardlink", False))
+			incremental = bool(request.get("incremental", False))
+		except (JSONDecodeError, KeyError, TypeError, ValueError) as e:
+			self._send_json(400, {"error": f"Invalid request: {e!r}"})
+			return
+
+		# The server's working directory means nothing to clients
+		if not dump_path.is_absolute() or not output_path.is_absolute():
+			self._send_json(400, {"error": "dump_path and output_path must be absolute"})
+			return
+
+		job = self.device_tree_server.submit(BatchEntry(dump_path, output_path), hardlink, incremental)
+		self._send_json(202, job.to_dict())
+
+	def address_string(self) -> str:
+		# Unix sockets clients don't have an address
+		return self.client_address[0] if self.client_address else "local"
+
+	def log_message(self, format: str, *args):
+		LOGI(f"{self.address_string()} {format % args}")
+
+	def _is_authorized(self) -> bool:
+		if self.hosts and self.headers.get("Host") not in self.hosts:
+			self._send_json(403, {"error": "Invalid Host"})
+			return False
+
+		if self.token and not compare_digest(self.headers.get("Authorization", "").encode(),
+		                                     f"Bearer {self.token}".encode()):
+			self._send_json(401, {"error": "Invalid or missing token"})
+			return False
+
+		return True
+
+	def _send_json(self, code: int, data):
+		body = dumps(data).encode()
+
+		self.send_response(code)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+	daemon_threads = True
+
+def serve(
+	device_tree_server: DeviceTreeServer,
+	socket_path: Path = DEFAULT_SOCKET_PATH,
+	port: Optional[int] = None,
+	token: Optional[str] = None,
+):
+	"""
+	Serve the API on a Unix socket only accessible by the current user,
+	or on localhost:port if given, until interrupted.
+
+	Over TCP, clients must send the token (a random one gets generated if not given)
+	and a localhost Host header.
+	"""
+	attributes = {"device_tree_server": device_tree_server}
+
+	if port is None:
+		socket_path.parent.mkdir(parents=True, exist_ok=True)
+		socket_path.unlink(missing_ok=True)
+
+		# Create the socket as 0600
+		old_umask = umask(0o177)
+		try:
+			http_server = ThreadingUnixHTTPServer(str(socket_path), type("Handler", (RequestHandler,), attributes))
+		finally:
+			umask(old_umask)
+
+		address = str(socket_path)
+	else:
+		if not token:
+			token = token_urlsafe(32)
+			LOGI(f"Token: {token}")
+
+		attributes["token"] = token
+		attributes["hosts"] = {f"127.0.0.1:{port}", f"localhost:{port}"}
+
+		http_server = ThreadingHTTPServer(("127.0.0.1", port), type("Handler", (RequestHandler,), attributes))
+		address = f"http://127.0.0.1:{port}"
+
+	# Stop gracefully when terminated, same as when interrupted
+	signal(SIGTERM, default_int_handler)
+
+	LOGI(f"Listening on {address}")
+
+	try:
+		http_server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		http_server.server_close()
+		if port is None:
+			socket_path.unlink(missing_ok=True)
+
+		LOGI("Waiting for the running jobs to finish")
+		device_tree_server.shutdown()
@@ -5,25 +5,44 @@
 #
 """aospdtgen templates utils."""
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.bccache import Bucket
+from os import environ
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Tuple
 
 from aospdtgen import module_path
+from aospdtgen.utils.profiler import profiler
 
-jinja_env = Environment(loader=FileSystemLoader(module_path / 'templates'),
-                        autoescape=True, trim_blocks=True, lstrip_blocks=True)
+TEMPLATES_CACHE_PATH = (
+	Path(environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "aospdtgen" / "templates"
+)
+"""Location of the compiled templates cache"""
+
+class TemplatesBytecodeCache(FileSystemBytecodeCache):
+	"""
+	Persistent cache of the compiled templates, so they only get compiled
+	again when their source or the Python version change (checked by Jinja2).
 
-def render_template(path: Optional[Path], template_file: str,
-                    out_file: str = '', to_file=True, **kwargs):
-	template = jinja_env.get_template(f"{template_file}.jinja2")
-	rendered_template = template.render(**kwargs)
+	Failing to write it isn't fatal, the templates just get compiled every time.
+	"""
+	def dump_bytecode(self, bucket: Bucket):
+		try:
+			Path(self.directory).mkdir(parents=True, exist_ok=True)
+			super().dump_bytecode(bucket)
+		except OSError:
+			pass
 
-	if to_file:
-		if not out_file:
-			out_file = template_file
+jinja_env = Environment(loader=FileSystemLoader(module_path / 'templates'),
+                        autoescape=True, trim_blocks=True, lstrip_blocks=True,
+                        bytecode_cache=TemplatesBytecodeCache(str(TEMPLATES_CACHE_PATH)))
 
-		with open(f"{path}/{out_file}", 'w', encoding="utf-8") as out:
-			out.write(rendered_template)
+def render_templates(templates: List[Tuple[str, Dict[str, Any]]], context: Dict[str, Any]) -> List[str]:
+	"""Render each template with the shared context plus its own variables."""
+	rendered_templates: List[str] = []
+	for template_file, kwargs in templates:
+		with profiler.span(template_file, "template"):
+			template = jinja_env.get_template(f"{template_file}.jinja2")
+			rendered_templates.append(template.render(context, **kwargs))
 
-	return rendered_template
+	return rendered_templates
@@ -4,21 +4,33 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from sebaubuntu_libs.libaik import AIKImageInfo, AIKManager
-from typing import Optional, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
+
+from aospdtgen.utils.boot_image import BootImage
+
+def get_prebuilts(image: BootImage) -> Tuple[Optional[Path], Optional[Path], Optional[Path], Optional[Path]]:
+	"""Extract the kernel, DT, DTB and DTBO of an image."""
+	return image.kernel, image.dt, image.dtb, image.dtbo
 
 class BootConfiguration:
 	"""Class representing a device's boot configuration."""
-	def __init__(self, dump_path: Path):
+	def __init__(self, dump_path: Path, jobs: int = 1):
 		"""
 		Given the path to a dump, parse all the images
 		and generate a boot configuration.
+
+		Only the images headers get parsed here, images get unpacked once
+		the prebuilts are needed. With jobs > 1, they get unpacked concurrently
+		using that many threads.
 		"""
 		self.dump_path = dump_path
+		self.jobs = jobs
 
 		self.boot = self._get_image_path("boot")
-		self.dtbo = self._get_image_path("dtbo")
+		self.dtbo_image = self._get_image_path("dtbo")
 		self.init_boot = self._get_image_path("init_boot")
 		self.recovery = self._get_image_path("recovery")
 		self.vendor_boot = self._get_image_path("vendor_boot")
@@ -26,39 +38,17 @@ class BootConfiguration:
 
 		assert self.boot, "No boot image found"
 
-		self.boot_aik_manager = AIKManager()
-		self.boot_image_info = self.boot_aik_manager.unpackimg(self.boot)
-
-		self.init_boot_aik_manager, self.init_boot_image_info = self._extract_if_exists(
-			self.init_boot
-		)
-
-		self.recovery_aik_manager, self.recovery_image_info = self._extract_if_exists(
-			self.recovery
-		)
-
-		self.vendor_boot_aik_manager, self.vendor_boot_image_info = self._extract_if_exists(
-			self.vendor_boot
-		)
-
-		self.vendor_kernel_boot_aik_manager, self.vendor_kernel_boot_image_info = self._extract_if_exists(
-			self.vendor_kernel_boot
-		)
-
-		self.kernel = self.boot_image_info.kernel
-		self.dt = self.boot_image_info.dt
-		self.dtb = self.boot_image_info.dtb
+		self.boot_image_info = BootImage(self.boot)
+		self.init_boot_image_info = self._get_boot_image(self.init_boot)
+		self.recovery_image_info = self._get_boot_image(self.recovery)
+		self.vendor_boot_image_info = self._get_boot_image(self.vendor_boot)
+		self.vendor_kernel_boot_image_info = self._get_boot_image(self.vendor_kernel_boot)
 
 		self.base_address = self.boot_image_info.base_address
 		self.cmdline = self.boot_image_info.cmdline
 		self.pagesize = self.boot_image_info.pagesize
 
 		if self.vendor_boot_image_info:
-			self.kernel = self.vendor_boot_image_info.kernel or self.kernel
-			self.dt = self.vendor_boot_image_info.dt or self.dt
-			self.dtb = self.vendor_boot_image_info.dtb or self.dtb
-			self.dtbo = self.vendor_boot_image_info.dtbo or self.dtbo
-
 			self.base_address = self.vendor_boot_image_info.base_address or self.base_address
 			self.cmdline = self.vendor_boot_image_info.cmdline or self.cmdline
 			self.pagesize = self.vendor_boot_image_info.pagesize or self.pagesize
@@ -69,57 +59,96 @@ class BootConfiguration:
 			self.pagesize = self.init_boot_image_info.pagesize or self.pagesize
 
 		if self.vendor_kernel_boot_image_info:
-			self.kernel = self.vendor_kernel_boot_image_info.kernel or self.kernel
-			self.dt = self.vendor_kernel_boot_image_info.dt or self.dt
-			self.dtb = self.vendor_kernel_boot_image_info.dtb or self.dtb
-			self.dtbo = self.vendor_kernel_boot_image_info.dtbo or self.dtbo
-
 			self.base_address = self.vendor_kernel_boot_image_info.base_address or self.base_address
 			self.cmdline = self.vendor_kernel_boot_image_info.cmdline or self.cmdline
 			self.pagesize = self.vendor_kernel_boot_image_info.pagesize or self.pagesize
 
+	@property
+	def kernel(self) -> Optional[Path]:
+		return self._prebuilts[0]
+
+	@property
+	def dt(self) -> Optional[Path]:
+		return self._prebuilts[1]
+
+	@property
+	def dtb(self) -> Optional[Path]:
+		return self._prebuilts[2]
+
+	@property
+	def dtbo(self) -> Optional[Path]:
+		return self._prebuilts[3]
+
+	@property
+	def recovery_resources_image(self) -> BootImage:
+		"""The image whose ramdisk contains the recovery resources."""
+		return self.recovery_image_info or self.boot_image_info
+
+	@cached_property
+	def _prebuilts(self) -> Tuple[Optional[Path], Optional[Path], Optional[Path], Optional[Path]]:
+		images = [
+			image for image in [
+				self.boot_image_info,
+				self.vendor_boot_image_info,
+				self.vendor_kernel_boot_image_info,
+			]
+			if image
+		]
+
+		# Images get extracted (or unpacked by AIK in its own processes
+		# and temporary folders) independently, so they can be handled at the same time
+		with ThreadPoolExecutor(max_workers=max(1, min(self.jobs, len(images)))) as executor:
+			list(executor.map(get_prebuilts, images))
+
+		kernel = self.boot_image_info.kernel
+		dt = self.boot_image_info.dt
+		dtb = self.boot_image_info.dtb
+		dtbo = self.dtbo_image
+
+		if self.vendor_boot_image_info:
+			kernel = self.vendor_boot_image_info.kernel or kernel
+			dt = self.vendor_boot_image_info.dt or dt
+			dtb = self.vendor_boot_image_info.dtb or dtb
+			dtbo = self.vendor_boot_image_info.dtbo or dtbo
+
+		if self.vendor_kernel_boot_image_info:
+			kernel = self.vendor_kernel_boot_image_info.kernel or kernel
+			dt = self.vendor_kernel_boot_image_info.dt or dt
+			dtb = self.vendor_kernel_boot_image_info.dtb or dtb
+			dtbo = self.vendor_kernel_boot_image_info.dtbo or dtbo
+
+		return kernel, dt, dtb, dtbo
+
 	def _get_image_path(self, partition: str) -> Union[Path, None]:
 		path = self.dump_path / f"{partition}.img"
 		return path if path.is_file() else None
 
 	@staticmethod
-	def _extract_if_exists(
-		image: Optional[Path]
-	) -> Tuple[Optional[AIKManager], Optional[AIKImageInfo]]:
+	def _get_boot_image(image: Optional[Path]) -> Optional[BootImage]:
 		if not image:
-			return None, None
-		
-		aik_manager = AIKManager()
-		image_info = aik_manager.unpackimg(image, ignore_ramdisk_errors=True)
-
-		return aik_manager, image_info
+			return None
 
-	def copy_files_to_folder(self, folder: Path) -> None:
-		"""Copy all prebuilts to a folder."""
-		if self.kernel:
-			(folder / "kernel").write_bytes(self.kernel.read_bytes())
+		return BootImage(image, ignore_ramdisk_errors=True)
 
-		if self.dt:
-			(folder / "dt.img").write_bytes(self.dt.read_bytes())
+	def get_prebuilt_files(self) -> Dict[str, Path]:
+		"""Get the prebuilts to ship, by their file name."""
+		prebuilt_files = {
+			"kernel": self.kernel,
+			"dt.img": self.dt,
+			"dtb.img": self.dtb,
+			"dtbo.img": self.dtbo,
+		}
 
-		if self.dtb:
-			(folder / "dtb.img").write_bytes(self.dtb.read_bytes())
-
-		if self.dtbo:
-			(folder / "dtbo.img").write_bytes(self.dtbo.read_bytes())
+		return {name: file for name, file in prebuilt_files.items() if file}
 
 	def cleanup(self):
 		"""Cleanup all the temporary files. Do not use this object anymore after calling this."""
-		self.boot_aik_manager.cleanup()
-
-		if self.init_boot_aik_manager:
-			self.init_boot_aik_manager.cleanup()
-
-		if self.recovery_aik_manager:
-			self.recovery_aik_manager.cleanup()
-
-		if self.vendor_boot_aik_manager:
-			self.vendor_boot_aik_manager.cleanup()
-
-		if self.vendor_kernel_boot_aik_manager:
-			self.vendor_kernel_boot_aik_manager.cleanup()
+		for image in [
+			self.boot_image_info,
+			self.init_boot_image_info,
+			self.recovery_image_info,
+			self.vendor_boot_image_info,
+			self.vendor_kernel_boot_image_info,
+		]:
+			if image:
+				image.cleanup()
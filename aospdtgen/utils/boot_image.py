@@ -0,0 +1,399 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from lzma import LZMAError
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from sebaubuntu_libs.libaik import AIKImageInfo, AIKManager
+from sebaubuntu_libs.liblogging import LOGI
+from struct import error as StructError, unpack_from
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+from zlib import error as ZlibError
+
+from aospdtgen.utils.profiler import profiler
+from aospdtgen.utils.ramdisk import iter_root_files
+
+BOOT_MAGIC = b"ANDROID!"
+VENDOR_BOOT_MAGIC = b"VNDRBOOT"
+
+BOOT_IMAGE_HEADER_V3_PAGESIZE = 4096
+"""Boot images v3 and v4 have a fixed page size"""
+
+KERNEL_OFFSET = 0x00008000
+"""Default kernel offset from the base address, used by mkbootimg"""
+
+MTK_HEADER_MAGIC = b"\x88\x16\x88\x58"
+"""MediaTek images prepend this header to the kernel and the ramdisk"""
+
+AVB_FOOTER_MAGIC = b"AVBf"
+AVB_FOOTER_SIZE = 64
+"""AVB signed images end with a footer starting with its magic"""
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+class BootImageHeader:
+	"""
+	Header of a boot or vendor_boot image (versions 0 to 4).
+
+	Values are formatted like AIK's split_img files, regions are
+	the (offset, size) in the image of each of its parts.
+	"""
+	def __init__(
+		self,
+		header_version: str,
+		base_address: Optional[str],
+		cmdline: Optional[str],
+		pagesize: Optional[str],
+		origsize: str,
+		regions: Dict[str, Tuple[int, int]],
+		sigtype: Optional[str] = None,
+	):
+		"""Initialize a boot image header."""
+		self.header_version = header_version
+		self.base_address = base_address
+		self.cmdline = cmdline
+		self.pagesize = pagesize
+		self.origsize = origsize
+		self.regions = regions
+		self.sigtype = sigtype
+
+	@classmethod
+	def from_file(cls, image: Path) -> Optional["BootImageHeader"]:
+		"""Parse the header of an image, or return None if it isn't a supported one."""
+		with image.open("rb") as f:
+			data = f.read(4096)
+
+		size = image.stat().st_size
+
+		try:
+			if data.startswith(BOOT_MAGIC):
+				header = cls._from_boot_header(data, size)
+			elif data.startswith(VENDOR_BOOT_MAGIC):
+				header = cls._from_vendor_boot_header(data, size)
+			else:
+				return None
+		except (StructError, ValueError):
+			return None
+
+		for offset, region_size in header.regions.values():
+			if offset + region_size > size:
+				return None
+
+		# AIK strips the MediaTek headers, let it handle those images
+		with image.open("rb") as f:
+			for offset, region_size in header.regions.values():
+				f.seek(offset)
+				if region_size and f.read(len(MTK_HEADER_MAGIC)) == MTK_HEADER_MAGIC:
+					return None
+
+			# Same signature type AIK reports
+			if size >= AVB_FOOTER_SIZE:
+				f.seek(size - AVB_FOOTER_SIZE)
+				if f.read(len(AVB_FOOTER_MAGIC)) == AVB_FOOTER_MAGIC:
+					header.sigtype = "AVBv2"
+
+		return header
+
+	@classmethod
+	def _from_boot_header(cls, data: bytes, size: int):
+		header_version, = unpack_from("<I", data, 40)
+
+		if header_version in (3, 4):
+			kernel_size, ramdisk_size = unpack_from("<II", data, 8)
+			cmdline, = unpack_from("<1536s", data, 44)
+			signature_size = unpack_from("<I", data, 1580)[0] if header_version == 4 else 0
+
+			regions = get_regions(BOOT_IMAGE_HEADER_V3_PAGESIZE, [
+				("header", BOOT_IMAGE_HEADER_V3_PAGESIZE),
+				("kernel", kernel_size),
+				("ramdisk", ramdisk_size),
+				("signature", signature_size),
+			])
+
+			return cls(
+				str(header_version),
+				None,
+				get_string(cmdline),
+				str(BOOT_IMAGE_HEADER_V3_PAGESIZE),
+				str(size),
+				regions,
+			)
+
+		kernel_size, kernel_address, ramdisk_size, _, second_size = unpack_from("<5I", data, 8)
+		pagesize, = unpack_from("<I", data, 36)
+		cmdline, extra_cmdline = unpack_from("<512s32x1024s", data, 64)
+		if not pagesize:
+			raise ValueError("Invalid page size")
+
+		# Old QCOM images store the DT size in place of the header version
+		dt_size = 0
+		if header_version > 4:
+			dt_size = header_version
+			header_version = 0
+
+		recovery_dtbo_size, recovery_dtbo_offset = (
+			unpack_from("<IQ", data, 1632) if header_version >= 1 else (0, 0)
+		)
+		dtb_size, = unpack_from("<I", data, 1648) if header_version >= 2 else (0,)
+
+		regions = get_regions(pagesize, [
+			("header", pagesize),
+			("kernel", kernel_size),
+			("ramdisk", ramdisk_size),
+			("second", second_size),
+			("dt", dt_size),
+			("recovery_dtbo", recovery_dtbo_size),
+			("dtb", dtb_size),
+		])
+
+		# The recovery DTBO offset is stored in the header
+		if recovery_dtbo_size:
+			regions["recovery_dtbo"] = (recovery_dtbo_offset, recovery_dtbo_size)
+
+		return cls(
+			str(header_version),
+			get_base_address(kernel_address),
+			get_string(cmdline.split(b"\0", 1)[0] + extra_cmdline),
+			str(pagesize),
+			str(size),
+			regions,
+		)
+
+	@classmethod
+	def _from_vendor_boot_header(cls, data: bytes, size: int):
+		header_version, pagesize, kernel_address, _, vendor_ramdisk_size = unpack_from("<5I", data, 8)
+		if header_version not in (3, 4):
+			raise ValueError(f"Unknown vendor_boot header version {header_version}")
+		if not pagesize:
+			raise ValueError("Invalid page size")
+
+		cmdline, = unpack_from("<2048s", data, 28)
+		header_size, dtb_size = unpack_from("<II", data, 2096)
+		vendor_ramdisk_table_size, _, _, bootconfig_size = (
+			unpack_from("<4I", data, 2112) if header_version == 4 else (0, 0, 0, 0)
+		)
+
+		regions = get_regions(pagesize, [
+			("header", header_size),
+			("vendor_ramdisk", vendor_ramdisk_size),
+			("dtb", dtb_size),
+			("vendor_ramdisk_table", vendor_ramdisk_table_size),
+			("bootconfig", bootconfig_size),
+		])
+
+		return cls(
+			str(header_version),
+			get_base_address(kernel_address),
+			get_string(cmdline),
+			str(pagesize),
+			str(size),
+			regions,
+		)
+
+def get_regions(pagesize: int, sizes: List[Tuple[str, int]]) -> Dict[str, Tuple[int, int]]:
+	"""Lay out the given regions one after the other, each one aligned to the page size."""
+	regions: Dict[str, Tuple[int, int]] = {}
+
+	offset = 0
+	for name, size in sizes:
+		regions[name] = (offset, size)
+		offset += (size + pagesize - 1) // pagesize * pagesize
+
+	return regions
+
+def get_base_address(kernel_address: int) -> str:
+	return f"0x{(kernel_address - KERNEL_OFFSET) & 0xFFFFFFFF:08x}"
+
+def get_string(value: bytes) -> Optional[str]:
+	"""Decode a NUL terminated header string, like AIK only its first line is kept."""
+	lines = value.split(b"\0", 1)[0].decode("utf-8", errors="replace").splitlines()
+	if not lines or not lines[0].strip():
+		return None
+
+	return lines[0].strip()
+
+class BootImage:
+	"""
+	A boot image.
+
+	Its header gets parsed directly and its parts get copied out of a memory
+	map of the image only once they're needed. Images whose format isn't
+	supported get unpacked with AIK instead.
+	"""
+	def __init__(self, path: Path, ignore_ramdisk_errors: bool = False):
+		"""Parse the header of a boot image."""
+		self.path = path
+		self.ignore_ramdisk_errors = ignore_ramdisk_errors
+
+		self.header = BootImageHeader.from_file(self.path)
+
+		self._lock = Lock()
+		self._tempdir: Optional[TemporaryDirectory] = None
+		self._regions_files: Dict[str, Optional[Path]] = {}
+		self._ramdisk_files: Dict[str, Optional[List[Path]]] = {}
+		self._aik_manager: Optional[AIKManager] = None
+		self._aik_image_info: Optional[AIKImageInfo] = None
+
+	@property
+	def header_version(self) -> Optional[str]:
+		return self.header.header_version if self.header else self.unpack().header_version
+
+	@property
+	def base_address(self) -> Optional[str]:
+		return self.header.base_address if self.header else self.unpack().base_address
+
+	@property
+	def cmdline(self) -> Optional[str]:
+		return self.header.cmdline if self.header else self.unpack().cmdline
+
+	@property
+	def pagesize(self) -> Optional[str]:
+		return self.header.pagesize if self.header else self.unpack().pagesize
+
+	@property
+	def origsize(self) -> Optional[str]:
+		return self.header.origsize if self.header else self.unpack().origsize
+
+	@property
+	def sigtype(self) -> Optional[str]:
+		return self.header.sigtype if self.header else self.unpack().sigtype
+
+	@property
+	def kernel(self) -> Optional[Path]:
+		return self.get_region_file("kernel") if self.header else self.unpack().kernel
+
+	@property
+	def dt(self) -> Optional[Path]:
+		return self.get_region_file("dt") if self.header else self.unpack().dt
+
+	@property
+	def dtb(self) -> Optional[Path]:
+		return self.get_region_file("dtb") if self.header else self.unpack().dtb
+
+	@property
+	def dtbo(self) -> Optional[Path]:
+		return self.get_region_file("recovery_dtbo") if self.header else self.unpack().dtbo
+
+	@property
+	def ramdisk_path(self) -> Path:
+		"""Folder containing the ramdisk unpacked by AIK."""
+		self.unpack()
+		return self._aik_manager.ramdisk_path
+
+	def get_ramdisk_files(self, suffix: str) -> List[Path]:
+		"""
+		Get the regular files in the root of the ramdisk with the given extension.
+
+		Only those files get extracted, streaming the ramdisk through the
+		built-in cpio reader, AIK is used if its compression isn't supported.
+		"""
+		with self._lock:
+			if suffix not in self._ramdisk_files:
+				self._ramdisk_files[suffix] = self._extract_ramdisk_files(suffix)
+
+		files = self._ramdisk_files[suffix]
+		if files is None:
+			files = [file for file in self.ramdisk_path.iterdir() if file.suffix == suffix]
+
+		return files
+
+	def _extract_ramdisk_files(self, suffix: str) -> Optional[List[Path]]:
+		if not self.header:
+			return None
+
+		region = "ramdisk" if "ramdisk" in self.header.regions else "vendor_ramdisk"
+		offset, size = self.header.regions[region]
+		if not size:
+			return []
+
+		start = perf_counter()
+
+		if self._tempdir is None:
+			self._tempdir = TemporaryDirectory()
+
+		folder = Path(self._tempdir.name) / f"{self.path.name}-{region}-files"
+		folder.mkdir(exist_ok=True)
+
+		files: Dict[str, Path] = {}
+
+		# Only the pages being decompressed get read
+		with self.path.open("rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as data, \
+				memoryview(data) as view:
+			root_files = iter_root_files(view[offset:offset + size], suffix)
+			if root_files is None:
+				return None
+
+			try:
+				for name, file_data in root_files:
+					file = folder / name
+					file.write_bytes(file_data)
+					files[name] = file
+			except (EOFError, IndexError, LZMAError, RuntimeError, StructError, ValueError, ZlibError):
+				return None
+			finally:
+				# Drop the views of the image before it gets unmapped
+				root_files.close()
+
+		LOGI(f"Extracted {len(files)} files from {self.path.name} {region} "
+		     f"in {perf_counter() - start:.2f}s")
+
+		return list(files.values())
+
+	def get_region_file(self, region: str) -> Optional[Path]:
+		"""
+		Get a file containing a region of the image,
+		or None if the image doesn't have it or it's empty.
+		"""
+		with self._lock:
+			if region not in self._regions_files:
+				self._regions_files[region] = self._extract_region(region)
+
+			return self._regions_files[region]
+
+	def _extract_region(self, region: str) -> Optional[Path]:
+		offset, size = self.header.regions.get(region, (0, 0))
+		if not size:
+			return None
+
+		if self._tempdir is None:
+			self._tempdir = TemporaryDirectory()
+
+		file = Path(self._tempdir.name) / f"{self.path.name}-{region}"
+
+		with self.path.open("rb") as f, mmap(f.fileno(), 0, access=ACCESS_READ) as data, \
+				file.open("wb") as out:
+			with memoryview(data) as view:
+				for start in range(offset, offset + size, COPY_CHUNK_SIZE):
+					out.write(view[start:min(start + COPY_CHUNK_SIZE, offset + size)])
+
+		return file
+
+	def unpack(self) -> AIKImageInfo:
+		"""Unpack the image with AIK, only the first time."""
+		with self._lock:
+			if self._aik_image_info is None:
+				start = perf_counter()
+
+				with profiler.span(f"unpack {self.path.name}", "aik"):
+					self._aik_manager = AIKManager()
+					self._aik_image_info = self._aik_manager.unpackimg(
+						self.path, ignore_ramdisk_errors=self.ignore_ramdisk_errors
+					)
+
+				LOGI(f"Unpacked {self.path.name} in {perf_counter() - start:.2f}s")
+
+		return self._aik_image_info
+
+	def cleanup(self):
+		"""Cleanup the temporary files, if any."""
+		if self._tempdir:
+			self._tempdir.cleanup()
+
+		if self._aik_manager:
+			self._aik_manager.cleanup()
@@ -0,0 +1,169 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from errno import EBADF, EINVAL, EMLINK, ENOSYS, ENOTSUP, ENOTTY, EOPNOTSUPP, EPERM, EXDEV
+from os import (
+	O_CREAT, O_RDONLY, O_TRUNC, O_WRONLY, SEEK_SET,
+	close, fstat, ftruncate, link, lseek, open as os_open, read, write,
+)
+from pathlib import Path
+from sebaubuntu_libs.liblogging import LOGI
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict
+
+try:
+	from fcntl import ioctl
+except ImportError:
+	ioctl = None
+
+try:
+	from os import copy_file_range
+except ImportError:
+	copy_file_range = None
+
+try:
+	from os import sendfile
+except ImportError:
+	sendfile = None
+
+FICLONE = 0x40049409
+"""Linux ioctl sharing the extents of a file with another one (reflink)"""
+
+FALLBACK_ERRNOS = (EBADF, EINVAL, ENOSYS, ENOTSUP, ENOTTY, EOPNOTSUPP, EXDEV)
+"""Errors meaning a copy method isn't supported by the kernel or the filesystems"""
+
+HARDLINK_FALLBACK_ERRNOS = (EMLINK, ENOTSUP, EOPNOTSUPP, EPERM, EXDEV)
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+class FileCopier:
+	"""
+	Copy files without reading them into Python memory.
+
+	Files get reflinked where the filesystem supports it, else copied in the
+	kernel with copy_file_range() or sendfile(), with a chunked copy as last resort.
+	With hardlink=True, files on the same filesystem of the destination
+	get hardlinked instead (they'll then share their content and permissions).
+
+	The number of files, the bytes copied and the time spent are kept
+	for all the copies done through the same instance.
+	"""
+	def __init__(self, hardlink: bool = False):
+		"""Initialize a file copier."""
+		self.hardlink = hardlink
+
+		self.files = 0
+		self.bytes_copied = 0
+		self.time = 0.0
+		self.methods: Dict[str, int] = {}
+
+		self._lock = Lock()
+
+	def copy(self, source: Path, destination: Path):
+		"""Copy source to destination, replacing it if it exists."""
+		start = perf_counter()
+
+		# Never write through an existing file, it may be a hardlink to the source
+		destination.unlink(missing_ok=True)
+
+		method, size = self._copy(source, destination)
+
+		with self._lock:
+			self.files += 1
+			self.bytes_copied += size
+			self.time += perf_counter() - start
+			self.methods[method] = self.methods.get(method, 0) + 1
+
+	def log_summary(self):
+		methods = ", ".join(f"{count} {method}" for method, count in sorted(self.methods.items()))
+		LOGI(f"Copied {self.files} files ({self.bytes_copied} bytes) in {self.time:.2f}s"
+		     f"{f' ({methods})' if methods else ''}")
+
+	def _copy(self, source: Path, destination: Path):
+		if self.hardlink:
+			try:
+				link(source, destination)
+				return "hardlink", source.stat().st_size
+			except OSError as e:
+				if e.errno not in HARDLINK_FALLBACK_ERRNOS:
+					raise
+
+		source_fd = os_open(source, O_RDONLY)
+		try:
+			destination_fd = os_open(destination, O_WRONLY | O_CREAT | O_TRUNC, 0o666)
+			try:
+				size = fstat(source_fd).st_size
+
+				methods: Dict[str, Callable[[int, int, int], bool]] = {
+					"reflink": copy_reflink,
+					"copy_file_range": copy_with_copy_file_range,
+					"sendfile": copy_with_sendfile,
+				}
+				for name, method in methods.items():
+					try:
+						if method(source_fd, destination_fd, size):
+							return name, size
+					except OSError as e:
+						if e.errno not in FALLBACK_ERRNOS:
+							raise
+
+					# Start again from scratch
+					ftruncate(destination_fd, 0)
+					lseek(source_fd, 0, SEEK_SET)
+					lseek(destination_fd, 0, SEEK_SET)
+
+				copy_chunked(source_fd, destination_fd)
+				return "chunked", size
+			finally:
+				close(destination_fd)
+		finally:
+			close(source_fd)
+
+def copy_reflink(source_fd: int, destination_fd: int, size: int) -> bool:
+	if ioctl is None:
+		raise OSError(ENOSYS, "ioctl() isn't available")
+
+	ioctl(destination_fd, FICLONE, source_fd)
+	return True
+
+def copy_with_copy_file_range(source_fd: int, destination_fd: int, size: int) -> bool:
+	"""Copy with copy_file_range(), return False if the file turned out to be shorter than expected."""
+	if copy_file_range is None:
+		raise OSError(ENOSYS, "copy_file_range() isn't available")
+
+	copied = 0
+	while copied < size:
+		count = copy_file_range(source_fd, destination_fd, size - copied, copied, copied)
+		if not count:
+			return False
+		copied += count
+
+	return True
+
+def copy_with_sendfile(source_fd: int, destination_fd: int, size: int) -> bool:
+	"""Copy with sendfile(), return False if the file turned out to be shorter than expected."""
+	if sendfile is None:
+		raise OSError(ENOSYS, "sendfile() isn't available")
+
+	copied = 0
+	while copied < size:
+		count = sendfile(destination_fd, source_fd, copied, size - copied)
+		if not count:
+			return False
+		copied += count
+
+	return True
+
+def copy_chunked(source_fd: int, destination_fd: int):
+	while True:
+		chunk = read(source_fd, COPY_CHUNK_SIZE)
+		if not chunk:
+			break
+
+		view = memoryview(chunk)
+		while view:
+			view = view[write(destination_fd, view):]
@@ -0,0 +1,125 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from os import scandir
+from pathlib import Path
+from sys import intern
+from typing import Dict, List, Tuple
+
+class FileEntry:
+	"""
+	A file of a partition.
+
+	It exposes the same attributes of a relative Path that the blob filter
+	and the sections classifier need, without having to build one.
+	Directories, top-level folders and extensions are interned strings shared
+	by all the entries.
+	"""
+	__slots__ = ("id", "directory", "top", "name", "suffix")
+
+	def __init__(self, id: int, directory: str, top: str, name: str, suffix: str):
+		"""Initialize a file entry."""
+		self.id = id
+		"""Index of the file in the file table"""
+		self.directory = directory
+		"""Parent folder relative to the partition, empty for the root"""
+		self.top = top
+		"""First component of the path"""
+		self.name = name
+		"""File name"""
+		self.suffix = suffix
+		"""File extension, same as Path.suffix"""
+
+	def __str__(self):
+		return self.path
+
+	def __repr__(self):
+		return f"FileEntry({self.id}, {self.path!r})"
+
+	@property
+	def path(self) -> str:
+		"""Path relative to the partition, using "/" as separator."""
+		return f"{self.directory}/{self.name}" if self.directory else self.name
+
+	@property
+	def parts(self) -> Tuple[str, ...]:
+		return (*self.directory.split("/"), self.name) if self.directory else (self.name,)
+
+	@property
+	def stem(self) -> str:
+		return self.name[:len(self.name) - len(self.suffix)]
+
+def get_suffix(name: str) -> str:
+	"""Get the extension of a file name, same as Path.suffix."""
+	position = name.rfind(".")
+	if 0 < position < len(name) - 1:
+		return name[position:]
+
+	return ""
+
+class FileTable:
+	"""
+	Table of all the files of a partition, built with a single walk of it.
+
+	Files are kept in walk order, the same one of AndroidPartition.files,
+	and FileEntry.id is their index in it.
+	"""
+	def __init__(self, path: Path):
+		"""Walk the partition and store its files."""
+		self.path = path
+
+		self.files: List[FileEntry] = []
+		self._files_by_top: Dict[str, List[FileEntry]] = {}
+
+		self._walk(str(self.path), "", "")
+
+	def _walk(self, path: str, directory: str, top: str):
+		with scandir(path) as entries:
+			for entry in entries:
+				# Like Path.is_file() and Path.is_dir(), symlinks get followed
+				if entry.is_file():
+					name = intern(entry.name)
+					file = FileEntry(
+						len(self.files),
+						directory,
+						top or name,
+						name,
+						intern(get_suffix(name)),
+					)
+					self.files.append(file)
+					self._files_by_top.setdefault(file.top, []).append(file)
+				elif entry.is_dir():
+					name = intern(entry.name)
+					self._walk(
+						entry.path,
+						intern(f"{directory}/{name}" if directory else name),
+						top or name,
+					)
+
+	def get_files(self, folder: str = "", suffix: str = "") -> List[FileEntry]:
+		"""
+		Get the files inside the given folder (relative to the partition, recursively),
+		optionally only the ones with the given extension.
+		"""
+		if folder:
+			top, _, subfolder = folder.partition("/")
+			files = self._files_by_top.get(top, [])
+			if subfolder:
+				files = [
+					file for file in files
+					if file.directory == folder or file.directory.startswith(f"{folder}/")
+				]
+		else:
+			files = self.files
+
+		if suffix:
+			files = [file for file in files if file.suffix == suffix]
+
+		return list(files)
+
+	def get_path(self, file: FileEntry) -> Path:
+		"""Get the absolute path of a file."""
+		return self.path / file.path
@@ -4,51 +4,43 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
-from pathlib import Path
-from typing import Dict
-from sebaubuntu_libs.libandroid.props import BuildProp
+from typing import Dict, List, Mapping, TextIO
 
-from aospdtgen.proprietary_files.section import sections
+from aospdtgen.proprietary_files.section import classifier
 from aospdtgen.utils.ignored_props import IGNORED_PROPS
+from aospdtgen.utils.prop_store import PropView
 
-def dump_partition_build_prop(build_prop: BuildProp, destination_file_path: Path):
-	"""Filter, order and format the build properties and write to file."""
-	filtered_build_props = BuildProp()
-	filtered_build_props.import_props(build_prop)
+def get_partition_props(build_prop: Mapping[str, str]) -> PropView:
+	"""Get a view of the build properties without the ignored ones."""
+	return PropView(build_prop).filter(lambda prop: prop not in IGNORED_PROPS)
 
-	# Remove ignored properties
-	for ignored_prop in IGNORED_PROPS:
-		filtered_build_props.pop(ignored_prop, None)
+def write_partition_build_prop(build_prop: Mapping[str, str], f: TextIO):
+	"""Filter, order and format the build properties, writing them to a file-like object."""
+	props = get_partition_props(build_prop)
 
-	# Don't write the file if there are no properties
-	if not filtered_build_props:
-		return
+	section_to_props: Dict[int, List[str]] = {}
+	misc_props: List[str] = []
 
-	section_to_props: Dict[str, BuildProp] = {}
+	# Route each property to the first section matching it in a single pass
+	for prop in props:
+		index = classifier.get_property_section_index(prop)
+		if index is None:
+			misc_props.append(prop)
+		else:
+			section_to_props.setdefault(index, []).append(prop)
 
-	for section in sections:
-		section_props = BuildProp()
+	sections_props = [
+		(classifier.sections[index].name, section_to_props[index])
+		for index in sorted(section_to_props)
+	]
 
-		# Check if the prop belongs to the section
-		for key, value in filtered_build_props.items():
-			if section.property_match(key):
-				section_props.set_prop(key, value)
-
-		# Remove the matched properties from the filtered build props
-		for prop in section_props.keys():
-			filtered_build_props.pop(prop, None)
-
-		if section_props:
-			section_to_props[section.name] = section_props
-	
 	# Add the non matched props to a "Miscellaneous" section
-	if filtered_build_props:
-		section_to_props["Miscellaneous"] = filtered_build_props
-
-	# Write the properties to the file
-	with destination_file_path.open("w") as f:
-		for section, props in section_to_props.items():
-			f.write(f"# {section}\n")
-			for prop in sorted(props.keys()):
-				f.write(f"{prop}={build_prop.get_prop(prop)}\n")
-			f.write("\n")
+	if misc_props:
+		sections_props.append(("Miscellaneous", misc_props))
+
+	# Format the properties
+	for section, section_props in sections_props:
+		f.write(f"# {section}\n")
+		for prop in sorted(section_props):
+			f.write(f"{prop}={props[prop]}\n")
+		f.write("\n")
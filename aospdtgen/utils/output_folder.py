@@ -0,0 +1,190 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from contextlib import contextmanager
+from hashlib import sha256
+from os import chmod, replace, walk
+from pathlib import Path
+from sebaubuntu_libs.liblogging import LOGI
+from shutil import rmtree
+from typing import IO, Iterator, Optional, Set
+
+from aospdtgen.utils.file_copier import FileCopier
+from aospdtgen.utils.profiler import profiler
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+OUTPUT_MARKERS = ("extract-files.sh", "proprietary-files.txt", "setup-makefiles.sh")
+"""Files every generated device tree has"""
+
+WRITE_BUFFER_SIZE = 256 * 1024
+"""Buffer size of the output files, generated files get written a line at a time"""
+
+class OutputFolder:
+	"""
+	A folder getting filled with generated files, referenced by their path relative to it.
+
+	By default the folder gets emptied first. In incremental mode, every output
+	is instead compared by size and hash with what is already on disk and only
+	replaced if it changed, so unchanged files keep their mtime.
+	Anything that doesn't get written again is then removed by finish().
+	"""
+	def __init__(self, path: Path, incremental: bool = False, file_copier: Optional[FileCopier] = None):
+		"""Initialize an output folder, emptying it unless in incremental mode."""
+		self.path = path
+		self.incremental = incremental
+		self.file_copier = file_copier or FileCopier()
+
+		self.written = 0
+		self.skipped = 0
+		self.removed = 0
+
+		self._outputs: Set[Path] = set()
+		self._stale: Set[Path] = set()
+
+		if self.path.is_dir():
+			if self.incremental:
+				self._stale = get_tree(self.path)
+			else:
+				rmtree(self.path)
+
+		self.path.mkdir(parents=True, exist_ok=True)
+
+	def mkdir(self, name: str):
+		path = self._add_output(name)
+		if path.is_symlink() or path.exists() and not path.is_dir():
+			path.unlink()
+
+		path.mkdir(exist_ok=True)
+
+	@contextmanager
+	def open(self, name: str, mode: str = "w") -> Iterator[IO]:
+		"""
+		Open an output file for writing. In incremental mode the content goes to
+		a temporary file, replacing the existing one only if they differ once closed.
+		"""
+		with profiler.span("write", "output"):
+			path = self._add_output(name)
+			encoding = None if "b" in mode else "utf-8"
+
+			if not self.incremental:
+				# Never write through an existing file, it may be a hardlink to a dump file
+				path.unlink(missing_ok=True)
+
+				with path.open(mode, WRITE_BUFFER_SIZE, encoding) as f:
+					yield f
+
+				self.written += 1
+				return
+
+			temp_path = path.with_name(f".{path.name}.tmp")
+			try:
+				with temp_path.open(mode, WRITE_BUFFER_SIZE, encoding) as f:
+					yield f
+
+				if is_same_content(temp_path, path):
+					temp_path.unlink()
+					self.skipped += 1
+				else:
+					if path.is_dir() and not path.is_symlink():
+						rmtree(path)
+					replace(temp_path, path)
+					self.written += 1
+			finally:
+				temp_path.unlink(missing_ok=True)
+
+	def write_text(self, name: str, text: str):
+		with self.open(name) as f:
+			f.write(text)
+
+	def copy(self, source: Path, name: str):
+		with profiler.span("copy", "output"):
+			path = self._add_output(name)
+
+			if self.incremental and is_same_content(source, path):
+				self.skipped += 1
+				return
+
+			if path.is_dir() and not path.is_symlink():
+				rmtree(path)
+
+			self.file_copier.copy(source, path)
+			self.written += 1
+
+	def chmod(self, name: str, mode: int):
+		chmod(self.path / name, mode)
+
+	def finish(self):
+		"""Remove the files that weren't written again and log a summary."""
+		# Children first, so stale folders are empty by the time they're removed
+		for name in sorted(self._stale - self._outputs, key=lambda name: len(name.parts), reverse=True):
+			path = self.path / name
+			if not path.exists() and not path.is_symlink():
+				# Already replaced by an output
+				continue
+
+			if path.is_dir() and not path.is_symlink():
+				path.rmdir()
+			else:
+				path.unlink(missing_ok=True)
+				self.removed += 1
+
+		self.file_copier.log_summary()
+		LOGI(f"Output files: {self.written} written, {self.skipped} unchanged, {self.removed} removed")
+
+	def _add_output(self, name: str) -> Path:
+		relative_path = Path(name)
+		self._outputs.add(relative_path)
+		self._outputs.update(relative_path.parents)
+
+		return self.path / relative_path
+
+def is_output_folder(path: Path) -> bool:
+	"""Check whether a path can be used as output: missing, an empty folder or a generated device tree."""
+	if path.is_symlink():
+		return False
+
+	if not path.exists():
+		return True
+
+	if not path.is_dir():
+		return False
+
+	if not any(path.iterdir()):
+		return True
+
+	return all((path / marker).is_file() for marker in OUTPUT_MARKERS)
+
+def get_tree(path: Path) -> Set[Path]:
+	"""Get the relative paths of all the files and folders in a folder."""
+	tree: Set[Path] = set()
+
+	for dirpath, dirnames, filenames in walk(path):
+		relative_dirpath = Path(dirpath).relative_to(path)
+		tree.update(relative_dirpath / name for name in dirnames + filenames)
+
+	return tree
+
+def is_same_content(source: Path, destination: Path) -> bool:
+	"""Check whether destination is a regular file with the same size and hash of source."""
+	if destination.is_symlink() or not destination.is_file():
+		return False
+
+	if source.stat().st_size != destination.stat().st_size:
+		return False
+
+	if source.samefile(destination):
+		return True
+
+	return get_file_hash(source) == get_file_hash(destination)
+
+def get_file_hash(path: Path) -> bytes:
+	file_hash = sha256()
+	with path.open("rb") as f:
+		for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+			file_hash.update(chunk)
+
+	return file_hash.digest()
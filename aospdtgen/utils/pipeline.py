@@ -0,0 +1,76 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from aospdtgen.utils.profiler import profiler
+
+class Pipeline:
+	"""
+	A set of named stages, each one depending on the stages it needs the results of.
+
+	Once run, every stage starts as soon as all its dependencies are done,
+	concurrently with any other stage that is ready.
+	"""
+	def __init__(self):
+		"""Initialize an empty pipeline."""
+		self.stages: Dict[str, Tuple[Callable[[], None], List[str]]] = {}
+
+	def add_stage(
+		self,
+		name: str,
+		function: Callable[[], None],
+		dependencies: Optional[List[str]] = None,
+	):
+		"""
+		Add a stage. Dependencies must be added first,
+		so the stages order is always a valid sequential order.
+		"""
+		assert name not in self.stages, f"Duplicate stage: {name}"
+
+		dependencies = dependencies or []
+		for dependency in dependencies:
+			assert dependency in self.stages, f"Unknown dependency of stage {name}: {dependency}"
+
+		self.stages[name] = (function, dependencies)
+
+	def run(self, jobs: int = 1):
+		"""
+		Run all the stages, using up to jobs threads.
+
+		With jobs == 1, stages are run one after the other in the order they were added.
+		If a stage fails, no other stage is started and its exception is raised.
+		"""
+		if jobs <= 1:
+			for name in self.stages:
+				self._run_stage(name)
+			return
+
+		pending = dict(self.stages)
+		done: Set[str] = set()
+		running: Dict[Future, str] = {}
+
+		with ThreadPoolExecutor(max_workers=jobs) as executor:
+			while pending or running:
+				ready = [
+					name for name, (_, dependencies) in pending.items()
+					if all(dependency in done for dependency in dependencies)
+				]
+				for name in ready:
+					pending.pop(name)
+					running[executor.submit(self._run_stage, name)] = name
+
+				finished, _ = wait(running, return_when=FIRST_COMPLETED)
+				for future in finished:
+					name = running.pop(future)
+					future.result()
+					done.add(name)
+
+	def _run_stage(self, name: str):
+		function, _ = self.stages[name]
+		with profiler.span(name, "stage"):
+			function()
@@ -0,0 +1,158 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from contextlib import contextmanager, nullcontext
+from json import dump
+from os import getpid
+from pathlib import Path
+from resource import RUSAGE_SELF, getrusage
+from threading import Lock, get_native_id
+from time import perf_counter, thread_time
+from typing import Any, ContextManager, Dict, Iterator, List, Tuple
+
+def get_peak_rss() -> int:
+	"""Peak resident set size of this process in KiB (Linux)."""
+	return getrusage(RUSAGE_SELF).ru_maxrss
+
+class Span:
+	"""A finished span, times are in seconds."""
+	def __init__(
+		self,
+		name: str,
+		category: str,
+		start: float,
+		wall_time: float,
+		cpu_time: float,
+		rss_delta: int,
+		thread_id: int,
+		args: Dict[str, Any],
+	):
+		self.name = name
+		self.category = category
+		self.start = start
+		self.wall_time = wall_time
+		self.cpu_time = cpu_time
+		self.rss_delta = rss_delta
+		self.thread_id = thread_id
+		self.args = args
+
+class Profiler:
+	"""
+	Records named spans of code, with their wall time, CPU time and peak RSS growth.
+
+	It's disabled by default, spans are then no-ops.
+	CPU time is the one of the thread running the span, so work done by child
+	processes (e.g. the ELF parsing pool) isn't counted. The RSS delta is how
+	much the peak RSS of the whole process grew during the span, whichever
+	thread allocated the memory.
+	"""
+	def __init__(self):
+		"""Initialize a disabled profiler."""
+		self.enabled = False
+		self.spans: List[Span] = []
+
+		self._start = perf_counter()
+		self._lock = Lock()
+
+	def enable(self):
+		self.enabled = True
+		self._start = perf_counter()
+
+	def span(self, name: str, category: str, **args: Any) -> ContextManager[None]:
+		"""Time a block of code, args are added to the trace event."""
+		if not self.enabled:
+			return nullcontext()
+
+		return self._span(name, category, args)
+
+	@contextmanager
+	def _span(self, name: str, category: str, args: Dict[str, Any]) -> Iterator[None]:
+		rss = get_peak_rss()
+		cpu_time = thread_time()
+		start = perf_counter()
+
+		try:
+			yield
+		finally:
+			span = Span(
+				name,
+				category,
+				start - self._start,
+				perf_counter() - start,
+				thread_time() - cpu_time,
+				get_peak_rss() - rss,
+				get_native_id(),
+				args,
+			)
+
+			with self._lock:
+				self.spans.append(span)
+
+	def format_summary(self) -> str:
+		"""Format a table of the spans grouped by category and name, slowest first."""
+		groups: Dict[Tuple[str, str], List[Span]] = {}
+		with self._lock:
+			for span in self.spans:
+				groups.setdefault((span.category, span.name), []).append(span)
+
+		rows = [
+			(
+				category,
+				name,
+				len(spans),
+				sum(span.wall_time for span in spans),
+				sum(span.cpu_time for span in spans),
+				sum(span.rss_delta for span in spans),
+			)
+			for (category, name), spans in groups.items()
+		]
+		rows.sort(key=lambda row: row[3], reverse=True)
+
+		category_width = max([len("Category")] + [len(row[0]) for row in rows])
+		name_width = max([len("Name")] + [len(row[1]) for row in rows])
+
+		lines = [
+			f"{'Category':<{category_width}}  {'Name':<{name_width}}  "
+			f"{'Count':>7}  {'Wall (s)':>9}  {'CPU (s)':>9}  {'Peak RSS +MiB':>13}"
+		]
+		for category, name, count, wall_time, cpu_time, rss_delta in rows:
+			lines.append(
+				f"{category:<{category_width}}  {name:<{name_width}}  "
+				f"{count:>7}  {wall_time:>9.3f}  {cpu_time:>9.3f}  {rss_delta / 1024:>13.1f}"
+			)
+
+		return "\n".join(lines)
+
+	def get_chrome_trace(self) -> Dict[str, Any]:
+		"""Get the spans as Chrome trace events, viewable with Perfetto or chrome://tracing."""
+		pid = getpid()
+
+		with self._lock:
+			events = [
+				{
+					"name": span.name,
+					"cat": span.category,
+					"ph": "X",
+					"ts": round(span.start * 1000000),
+					"dur": round(span.wall_time * 1000000),
+					"pid": pid,
+					"tid": span.thread_id,
+					"args": {
+						**span.args,
+						"cpu_ms": round(span.cpu_time * 1000, 3),
+						"peak_rss_delta_kib": span.rss_delta,
+					},
+				}
+				for span in self.spans
+			]
+
+		return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+	def write_chrome_trace(self, path: Path):
+		with path.open("w") as f:
+			dump(self.get_chrome_trace(), f)
+
+profiler = Profiler()
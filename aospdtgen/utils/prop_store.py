@@ -0,0 +1,96 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from collections import ChainMap
+from sebaubuntu_libs.libandroid.partitions.partition_model import PartitionModel
+from sebaubuntu_libs.libcompat.distutils.util import strtobool
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional
+
+class PropView(Mapping[str, str]):
+	"""
+	Read-only view of build props, with the same getters of BuildProp.
+
+	filter() returns another view only showing the props accepted by a function,
+	nothing gets copied.
+	"""
+	def __init__(self, props: Mapping[str, str], keep: Optional[Callable[[str], bool]] = None):
+		"""Initialize a view of props, only showing the keys for which keep returns True if given."""
+		self._props = props
+		self._keep = keep
+
+	def __getitem__(self, key: str) -> str:
+		if self._keep and not self._keep(key):
+			raise KeyError(key)
+
+		return self._props[key]
+
+	def __iter__(self) -> Iterator[str]:
+		if not self._keep:
+			return iter(self._props)
+
+		return filter(self._keep, self._props)
+
+	def __len__(self) -> int:
+		if not self._keep:
+			return len(self._props)
+
+		return sum(1 for _ in self)
+
+	def __bool__(self) -> bool:
+		return any(True for _ in self)
+
+	def filter(self, keep: Callable[[str], bool]) -> "PropView":
+		return PropView(self, keep)
+
+	def _get_prop(self, key: str, data_type: Callable[[str], Any] = str, default: Any = None):
+		if key in self:
+			try:
+				return data_type(self[key])
+			except ValueError:
+				return default
+		else:
+			return default
+
+	def get_prop(self, key: str, default: Optional[str] = None) -> Optional[str]:
+		return self._get_prop(key, str, default)
+
+	def get_prop_bool(self, key: str, default: bool = False) -> bool:
+		return self._get_prop(key, lambda x: bool(strtobool(x)), default)
+
+	def get_prop_int(self, key: str, default: int = 0) -> int:
+		return self._get_prop(key, int, default)
+
+	def get_prop_float(self, key: str, default: float = 0.0) -> float:
+		return self._get_prop(key, float, default)
+
+class PropStore:
+	"""
+	Immutable store of the build props of all the partitions.
+
+	Keys and values go through a single string table, so each distinct string is
+	kept once no matter how many partitions define it. Each partition's props are
+	then a view over the store, and so are the merged props of all of them.
+	"""
+	def __init__(self, build_props: Dict[PartitionModel, Mapping[str, str]]):
+		"""
+		Store the props of each partition, in the order they get merged in
+		(props of later partitions override the ones of earlier partitions).
+		"""
+		strings: Dict[str, str] = {}
+
+		self._props: Dict[PartitionModel, Dict[str, str]] = {
+			model: {
+				strings.setdefault(key, key): strings.setdefault(value, value)
+				for key, value in props.items()
+			}
+			for model, props in build_props.items()
+		}
+
+		self.merged = PropView(ChainMap(*reversed(self._props.values())))
+		"""Props of all the partitions, later partitions taking precedence"""
+
+	def get_partition(self, model: PartitionModel) -> PropView:
+		return PropView(self._props[model])
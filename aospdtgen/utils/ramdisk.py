@@ -0,0 +1,199 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from lzma import LZMADecompressor
+from stat import S_ISREG
+from struct import unpack_from
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+from zlib import MAX_WBITS, decompressobj
+
+try:
+	from lz4.block import LZ4BlockError, decompress as lz4_block_decompress
+	from lz4.frame import LZ4FrameDecompressor
+except ImportError:
+	# LZ4 compressed ramdisks get unpacked with AIK instead
+	lz4_block_decompress = None
+	LZ4FrameDecompressor = None
+
+from aospdtgen.utils.file_table import get_suffix
+
+GZIP_MAGIC = b"\x1f\x8b"
+LZ4_LEGACY_MAGIC = b"\x02\x21\x4c\x18"
+LZ4_FRAME_MAGIC = b"\x04\x22\x4d\x18"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+LZMA_MAGIC = b"\x5d\x00\x00"
+CPIO_NEWC_MAGICS = (b"070701", b"070702")
+
+CPIO_HEADER_SIZE = 110
+CPIO_TRAILER = "TRAILER!!!"
+
+LZ4_LEGACY_BLOCK_SIZE = 8 * 1024 * 1024
+"""Uncompressed size of the LZ4 legacy blocks, only the last one can be smaller"""
+
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+
+def iter_lz4_legacy(data: memoryview) -> Iterator[bytes]:
+	"""Decompress LZ4 legacy frames (as made by lz4 -l), one block at a time."""
+	position = 0
+	while position + 4 <= len(data):
+		if data[position:position + 4] == LZ4_LEGACY_MAGIC:
+			position += 4
+			continue
+
+		block_size, = unpack_from("<I", data, position)
+		position += 4
+		if not block_size:
+			break
+
+		try:
+			chunk = lz4_block_decompress(data[position:position + block_size],
+			                             uncompressed_size=LZ4_LEGACY_BLOCK_SIZE)
+		except LZ4BlockError as e:
+			raise ValueError(e) from e
+
+		yield chunk
+		position += block_size
+
+def iter_decompressor(data: memoryview, decompressor) -> Iterator[bytes]:
+	for start in range(0, len(data), DECOMPRESS_CHUNK_SIZE):
+		chunk = decompressor.decompress(data[start:start + DECOMPRESS_CHUNK_SIZE])
+		if chunk:
+			yield chunk
+
+		if decompressor.eof:
+			break
+
+def get_decompressed_chunks(data: memoryview) -> Optional[Iterator[bytes]]:
+	"""Decompress a ramdisk in chunks, or return None if the compression isn't supported."""
+	magic = bytes(data[:6])
+
+	if magic.startswith(CPIO_NEWC_MAGICS):
+		return (
+			bytes(data[start:start + DECOMPRESS_CHUNK_SIZE])
+			for start in range(0, len(data), DECOMPRESS_CHUNK_SIZE)
+		)
+
+	if magic.startswith(GZIP_MAGIC):
+		return iter_decompressor(data, decompressobj(16 + MAX_WBITS))
+
+	if magic.startswith(LZ4_LEGACY_MAGIC) and lz4_block_decompress:
+		return iter_lz4_legacy(data)
+
+	if magic.startswith(LZ4_FRAME_MAGIC) and LZ4FrameDecompressor:
+		return iter_decompressor(data, LZ4FrameDecompressor())
+
+	if magic.startswith(XZ_MAGIC) or magic.startswith(LZMA_MAGIC):
+		return iter_decompressor(data, LZMADecompressor())
+
+	return None
+
+class _ChunksReader:
+	"""Read exact amounts of bytes out of a stream of chunks."""
+	def __init__(self, chunks: Iterable[bytes]):
+		self.chunks = iter(chunks)
+		self.buffer = bytearray()
+		self.position = 0
+
+	def read(self, size: int) -> bytes:
+		while len(self.buffer) - self.position < size:
+			chunk = next(self.chunks, None)
+			if chunk is None:
+				raise EOFError("Truncated cpio archive")
+
+			del self.buffer[:self.position]
+			self.position = 0
+			self.buffer += chunk
+
+		result = bytes(self.buffer[self.position:self.position + size])
+		self.position += size
+
+		return result
+
+	def skip(self, size: int):
+		while len(self.buffer) - self.position < size:
+			size -= len(self.buffer) - self.position
+			self.buffer.clear()
+			self.position = 0
+
+			chunk = next(self.chunks, None)
+			if chunk is None:
+				raise EOFError("Truncated cpio archive")
+			self.buffer += chunk
+
+		self.position += size
+
+	def at_end(self) -> bool:
+		"""Check whether the stream is over, skipping any zero padding."""
+		while True:
+			while self.position < len(self.buffer):
+				if self.buffer[self.position]:
+					return False
+				self.position += 1
+
+			self.buffer.clear()
+			self.position = 0
+
+			chunk = next(self.chunks, None)
+			if chunk is None:
+				return True
+			self.buffer += chunk
+
+def iter_cpio(
+	chunks: Iterable[bytes], want: Callable[[str, int], bool]
+) -> Iterator[Tuple[str, int, bytes]]:
+	"""
+	Go through (possibly concatenated) newc cpio archives, yielding the
+	(name, mode, data) of the entries for which want(name, mode) returns True.
+	Data of any other entry gets skipped without being kept in memory.
+	"""
+	reader = _ChunksReader(chunks)
+
+	while not reader.at_end():
+		header = reader.read(CPIO_HEADER_SIZE)
+		if header[:6] not in CPIO_NEWC_MAGICS:
+			raise ValueError("Invalid cpio header")
+
+		mode = int(header[14:22], 16)
+		file_size = int(header[54:62], 16)
+		name_size = int(header[94:102], 16)
+
+		name = reader.read(name_size)[:-1].decode("utf-8", errors="surrogateescape")
+		reader.skip(-(CPIO_HEADER_SIZE + name_size) % 4)
+
+		if name == CPIO_TRAILER:
+			continue
+
+		if want(name, mode):
+			yield name, mode, reader.read(file_size)
+		else:
+			reader.skip(file_size)
+
+		reader.skip(-file_size % 4)
+
+def iter_root_files(data: memoryview, suffix: str) -> Optional[Iterator[Tuple[str, bytes]]]:
+	"""
+	Get the (name, data) of the regular files in the root of a ramdisk with the given extension,
+	or None if the ramdisk compression isn't supported.
+	"""
+	chunks = get_decompressed_chunks(data)
+	if chunks is None:
+		return None
+
+	def want(name: str, mode: int) -> bool:
+		name = get_relative_name(name)
+		return S_ISREG(mode) and "/" not in name and get_suffix(name) == suffix
+
+	return (
+		(get_relative_name(name), file_data)
+		for name, _, file_data in iter_cpio(chunks, want)
+	)
+
+def get_relative_name(name: str) -> str:
+	"""Strip the leading "./" and "/" of a cpio entry name."""
+	while name.startswith("./"):
+		name = name[2:]
+
+	return name.lstrip("/")
@@ -0,0 +1,86 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from typing import Dict, Iterator, Optional, Tuple
+
+TERMINAL = ""
+"""Trie key marking the end of a registered sequence (real keys are never empty)."""
+
+WILDCARD = "."
+"""Regex character matching anything but a newline."""
+
+class Trie:
+	"""Trie mapping sequences (strings or tuples) to the lowest index that registered them."""
+	def __init__(self):
+		"""Initialize an empty trie."""
+		self.root: Dict[str, dict] = {}
+
+	def add(self, keys, index: int):
+		node = self.root
+		for key in keys:
+			node = node.setdefault(key, {})
+
+		node[TERMINAL] = min(node.get(TERMINAL, index), index)
+
+	def match_prefixes(self, keys, start: int = 0) -> Optional[int]:
+		"""Return the lowest index of any registered sequence that is a prefix of keys[start:]."""
+		result = None
+
+		node = self.root
+		for position in range(start, len(keys) + 1):
+			index = node.get(TERMINAL)
+			if index is not None and (result is None or index < result):
+				result = index
+
+			if position == len(keys):
+				break
+
+			node = node.get(keys[position])
+			if node is None:
+				break
+
+		return result
+
+	def match_wildcard_prefixes(self, string: str, start: int = 0) -> Iterator[Tuple[int, int]]:
+		"""
+		Treating the registered strings as regexes made of literal characters and
+		wildcards, yield (end, index) for every one of them matching string[start:end].
+		"""
+		stack = [(self.root, start)]
+		while stack:
+			node, position = stack.pop()
+
+			index = node.get(TERMINAL)
+			if index is not None:
+				yield position, index
+
+			if position == len(string):
+				continue
+
+			char = string[position]
+
+			child = node.get(char)
+			if child is not None:
+				stack.append((child, position + 1))
+
+			if char != WILDCARD and char != "\n":
+				child = node.get(WILDCARD)
+				if child is not None:
+					stack.append((child, position + 1))
+
+	def match_substrings(self, keys) -> Optional[int]:
+		"""Return the lowest index of any registered sequence contained in keys."""
+		result = None
+
+		for start in range(len(keys)):
+			if keys[start] not in self.root:
+				continue
+
+			index = self.match_prefixes(keys, start)
+			if index is not None and (result is None or index < result):
+				result = index
+
+		return result
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Compare extracting the prebuilts of boot images with the built-in parser against AIK.
+
+Usage: python3 -m benchmarks.boot_image [--aik] <image> [image ...]
+"""
+
+from pathlib import Path
+from sys import argv
+from time import perf_counter
+
+from aospdtgen.utils.boot_configuration import get_prebuilts
+from aospdtgen.utils.boot_image import BootImage
+
+def main():
+	use_aik = "--aik" in argv
+	images = [Path(arg) for arg in argv[1:] if arg != "--aik"]
+
+	print(f"{'image':<24} {'parser':>9} {'AIK':>9}")
+
+	for image in images:
+		start = perf_counter()
+		boot_image = BootImage(image)
+		if boot_image.header is None:
+			print(f"{image.name:<24} {'unsupported':>9}")
+			continue
+
+		prebuilts = get_prebuilts(boot_image)
+		parser_time = perf_counter() - start
+
+		aik_time = "-"
+		if use_aik:
+			start = perf_counter()
+			image_info = boot_image.unpack()
+			aik_time = f"{perf_counter() - start:.2f}s"
+
+			# The extracted files must match what AIK unpacks
+			for file, aik_file in zip(prebuilts, get_prebuilts(image_info)):
+				assert (file.read_bytes() if file else None) == (aik_file.read_bytes() if aik_file else None), \
+					f"{image.name}: {file} differs from {aik_file}"
+
+		boot_image.cleanup()
+
+		print(f"{image.name:<24} {parser_time:>8.3f}s {aik_time:>9}")
+
+if __name__ == '__main__':
+	main()
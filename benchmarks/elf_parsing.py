@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Measure how ELF parsing scales with the number of processes.
+
+Usage: python3 -m benchmarks.elf_parsing <dump partition path> [jobs ...]
+"""
+
+from os import cpu_count
+from pathlib import Path
+from sys import argv
+from time import perf_counter
+
+from aospdtgen.proprietary_files import elf
+from aospdtgen.proprietary_files.elf import get_elf_infos
+
+DEFAULT_JOBS = [1, 2, 4, 8, 16, 32]
+
+def main():
+	path = Path(argv[1])
+	jobs_list = [int(jobs) for jobs in argv[2:]] or DEFAULT_JOBS
+
+	# Always use the pool, that's what is being measured
+	elf.PROCESS_POOL_MIN_FILES = 0
+
+	files = [
+		file for folder in ["bin", "lib", "lib64"] if (path / folder).is_dir()
+		for file in (path / folder).rglob("*") if file.is_file()
+	]
+
+	print(f"{len(files)} files, {cpu_count()} CPUs\n")
+	print(f"{'jobs':>4} {'time':>8} {'speedup':>8}")
+
+	baseline = None
+	reference = None
+	for jobs in jobs_list:
+		start = perf_counter()
+		elf_infos = get_elf_infos(files, jobs)
+		elapsed = perf_counter() - start
+
+		# Results must not depend on the number of processes
+		needed_libs = {file: elf_info.needed_libs for file, elf_info in elf_infos.items()}
+		if reference is None:
+			reference = needed_libs
+		assert needed_libs == reference, f"Results differ with {jobs} jobs"
+
+		baseline = baseline or elapsed
+		print(f"{jobs:>4} {elapsed:>7.2f}s {baseline / elapsed:>7.2f}x")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Compare the memory mapped ELF reader against ELF.get_needed_libs()
+on all the files of a directory.
+
+Usage: python3 -m benchmarks.elf_reader <directory>
+"""
+
+from pathlib import Path
+from sebaubuntu_libs.libandroid.elf.elf import ELF
+from sys import argv
+from time import perf_counter
+
+from aospdtgen.proprietary_files.elf import ELFInfo
+
+def main():
+	files = [file for file in Path(argv[1]).rglob("*") if file.is_file() and not file.is_symlink()]
+	size = sum(file.stat().st_size for file in files)
+
+	print(f"{len(files)} files, {size / 1024 / 1024:.1f} MiB\n")
+
+	start = perf_counter()
+	expected = {file: ELF.get_needed_libs(file) for file in files}
+	legacy = perf_counter() - start
+
+	start = perf_counter()
+	result = {file: ELFInfo.from_file(file).needed_libs for file in files}
+	current = perf_counter() - start
+
+	mismatches = [file for file in files if expected[file] != result[file]]
+
+	print(f"ELF.get_needed_libs(): {legacy:.3f}s")
+	print(f"ELFInfo.from_file(): {current:.3f}s ({legacy / current:.1f}x)")
+	print(f"Mismatches: {len(mismatches)}")
+	for file in mismatches:
+		print(f"  {file}: {sorted(expected[file])} != {sorted(result[file])}")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Compare copying files through Python memory against FileCopier.
+
+Usage: python3 -m benchmarks.file_copier [--hardlink] <output folder> <file> [file ...]
+"""
+
+from pathlib import Path
+from resource import RUSAGE_SELF, getrusage
+from sys import argv
+from time import perf_counter
+
+from aospdtgen.utils.file_copier import FileCopier
+
+def get_peak_rss() -> int:
+	"""Peak resident set size of this process in KiB (Linux)."""
+	return getrusage(RUSAGE_SELF).ru_maxrss
+
+def main():
+	hardlink = "--hardlink" in argv
+	args = [arg for arg in argv[1:] if arg != "--hardlink"]
+	folder = Path(args[0])
+	files = [Path(arg) for arg in args[1:]]
+
+	folder.mkdir(parents=True, exist_ok=True)
+
+	# FileCopier first, the peak RSS can only grow
+	baseline = get_peak_rss()
+	file_copier = FileCopier(hardlink)
+	for file in files:
+		file_copier.copy(file, folder / file.name)
+	copier_peak = get_peak_rss()
+
+	print(f"FileCopier: {file_copier.files} files, {file_copier.bytes_copied} bytes "
+	      f"in {file_copier.time:.3f}s {file_copier.methods}, "
+	      f"peak RSS +{(copier_peak - baseline) / 1024:.1f} MiB")
+
+	start = perf_counter()
+	for file in files:
+		destination = folder / file.name
+		destination.unlink()
+		destination.write_bytes(file.read_bytes())
+	elapsed = perf_counter() - start
+
+	print(f"read_bytes/write_bytes: {elapsed:.3f}s, "
+	      f"peak RSS +{(get_peak_rss() - copier_peak) / 1024:.1f} MiB")
+
+if __name__ == '__main__':
+	main()
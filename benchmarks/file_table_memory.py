@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Measure the peak memory usage of indexing and classifying a partition's files.
+
+Usage: python3 -m benchmarks.file_table_memory <dump partition path>
+"""
+
+from pathlib import Path
+from resource import RUSAGE_SELF, getrusage
+from sys import argv
+from time import perf_counter
+
+import aospdtgen  # noqa: F401 (registers the sections)
+from aospdtgen.proprietary_files.ignore import blob_filter
+from aospdtgen.proprietary_files.section import classifier
+from aospdtgen.utils.file_table import FileTable
+
+def get_peak_rss() -> int:
+	"""Peak resident set size of this process in KiB (Linux)."""
+	return getrusage(RUSAGE_SELF).ru_maxrss
+
+def main():
+	path = Path(argv[1])
+
+	baseline = get_peak_rss()
+
+	start = perf_counter()
+	file_table = FileTable(path)
+	files = blob_filter.filter_allowed(file_table.files)
+	section_indexes = [classifier.get_section_index(file) for file in files]
+	elapsed = perf_counter() - start
+
+	peak = get_peak_rss()
+
+	print(f"{len(file_table.files)} files, {len(section_indexes)} allowed")
+	print(f"time: {elapsed:.2f}s")
+	print(f"peak RSS: {peak / 1024:.1f} MiB ({(peak - baseline) / 1024:.1f} MiB for the file table)")
+
+if __name__ == '__main__':
+	main()
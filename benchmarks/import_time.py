@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Compare the -X importtime of aospdtgen with the sections registry and with the section modules.
+
+Usage: python3 -m benchmarks.import_time [runs]
+"""
+
+from os import environ
+from statistics import median
+from subprocess import run
+from sys import argv, executable
+from typing import Tuple
+
+from aospdtgen.proprietary_files.registry import DYNAMIC_SECTIONS_ENV
+
+def get_import_time(dynamic: bool) -> Tuple[int, int]:
+	"""Self and cumulative import time of aospdtgen in us, in a new interpreter."""
+	env = dict(environ)
+	env.pop(DYNAMIC_SECTIONS_ENV, None)
+	if dynamic:
+		env[DYNAMIC_SECTIONS_ENV] = "1"
+
+	stderr = run(
+		[executable, "-X", "importtime", "-c", "import aospdtgen"],
+		env=env, capture_output=True, text=True, check=True,
+	).stderr
+
+	for line in stderr.splitlines():
+		self_time, cumulative_time, module = line.split(":", 1)[1].split("|")
+		if module.strip() == "aospdtgen":
+			return int(self_time), int(cumulative_time)
+
+	raise RuntimeError("aospdtgen import time not found")
+
+def main():
+	runs = int(argv[1]) if len(argv) > 1 else 10
+
+	print(f"{'sections':<16} {'self':>10} {'cumulative':>12}  (median of {runs} runs)")
+
+	for name, dynamic in [("registry", False), ("section modules", True)]:
+		times = [get_import_time(dynamic) for _ in range(runs)]
+		self_time = median(time[0] for time in times)
+		cumulative_time = median(time[1] for time in times)
+
+		print(f"{name:<16} {self_time / 1000:>8.1f}ms {cumulative_time / 1000:>10.1f}ms")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Compare the per-interface regexes that used to be built for every file
+against the precompiled interface patterns, over a synthetic 50k paths list.
+"""
+
+from pathlib import Path
+from random import Random
+from re import match
+from timeit import timeit
+
+from aospdtgen.proprietary_files.section import (
+	classifier,
+	is_known_interface_lib,
+	known_interfaces,
+)
+
+PATHS_COUNT = 50000
+
+def get_synthetic_paths(count: int):
+	random = Random(0)
+	paths = []
+	for i in range(count):
+		interface = random.choice(known_interfaces)
+		paths.append(random.choice([
+			Path(f"lib64/{interface}@1.{i % 4}.so"),
+			Path(f"lib/hw/{interface}@1.0-impl.so"),
+			Path(f"bin/hw/{interface}-service"),
+			Path(f"etc/init/{interface}-service.rc"),
+			Path(f"lib64/libvendor_{i}.so"),
+			Path(f"etc/vendor_{i}.xml"),
+		]))
+
+	return paths
+
+def is_known_interface_lib_legacy(lib: str):
+	for interface in known_interfaces:
+		if match(fr"{interface}(@[0-9]+\\.[0-9]+|-).*\\.so", lib):
+			return True
+
+	return False
+
+def main():
+	paths = get_synthetic_paths(PATHS_COUNT)
+	names = [path.name for path in paths]
+
+	print(f"{len(paths)} paths, {len(known_interfaces)} interfaces\n")
+
+	legacy = timeit(lambda: [is_known_interface_lib_legacy(name) for name in names], number=1)
+	current = timeit(lambda: [is_known_interface_lib(name) for name in names], number=1)
+	print(f"NEEDED libs interface check: {legacy:.3f}s -> {current:.3f}s ({legacy / current:.1f}x)")
+
+	current = timeit(lambda: [classifier.get_section_index(path) for path in paths], number=1)
+	print(f"Single-pass classification against all sections: {current:.3f}s")
+
+if __name__ == '__main__':
+	main()
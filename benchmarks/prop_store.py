@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+"""
+Compare merging the build props of the partitions into a new BuildProp against PropStore.
+
+Usage: python3 -m benchmarks.prop_store <build.prop> [build.prop ...]
+"""
+
+from gc import collect
+from pathlib import Path
+from sebaubuntu_libs.libandroid.props import BuildProp
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, reset_peak, start
+
+from aospdtgen.utils.prop_store import PropStore
+
+def load_build_props():
+	return {file: BuildProp.from_file(file) for file in map(Path, argv[1:])}
+
+def main():
+	start()
+
+	# BuildProp.import_props of every partition, like before
+	build_props = load_build_props()
+	collect()
+	baseline, _ = get_traced_memory()
+	reset_peak()
+
+	start_time = perf_counter()
+	merged = BuildProp()
+	for build_prop in build_props.values():
+		merged.import_props(build_prop)
+	elapsed = perf_counter() - start_time
+
+	current, peak = get_traced_memory()
+	print(f"BuildProp: {len(merged)} props merged in {elapsed * 1000:.1f}ms, "
+	      f"{(current - baseline) / 1024:.0f} KiB kept, {(peak - baseline) / 1024:.0f} KiB peak")
+
+	del build_props, merged
+	collect()
+
+	# PropStore, replacing the partitions' props with its views
+	build_props = load_build_props()
+	collect()
+	baseline, _ = get_traced_memory()
+	reset_peak()
+
+	start_time = perf_counter()
+	prop_store = PropStore(build_props)
+	for file in build_props:
+		build_props[file] = prop_store.get_partition(file)
+	merged = prop_store.merged
+	elapsed = perf_counter() - start_time
+
+	collect()
+	current, peak = get_traced_memory()
+	print(f"PropStore: {len(merged)} props merged in {elapsed * 1000:.1f}ms, "
+	      f"{(current - baseline) / 1024:.0f} KiB kept, {(peak - baseline) / 1024:.0f} KiB peak")
+
+if __name__ == '__main__':
+	main()
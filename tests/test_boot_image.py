@@ -0,0 +1,82 @@
+#
+# Copyright (C) 2024 The LineageOS Project
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from jinja2 import ChainableUndefined
+from pathlib import Path
+from struct import pack_into
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest import TestCase, main
+
+from aospdtgen.templates import jinja_env
+from aospdtgen.utils.boot_configuration import BootConfiguration
+from aospdtgen.utils.boot_image import AVB_FOOTER_MAGIC, AVB_FOOTER_SIZE, BOOT_MAGIC, BootImage
+
+PAGESIZE = 2048
+
+def make_boot_image(path: Path, avb_footer: bool):
+	"""Write a v2 boot image with a small kernel, optionally followed by an AVB footer."""
+	kernel = b"\0" * 1000
+
+	header = bytearray(PAGESIZE)
+	header[:len(BOOT_MAGIC)] = BOOT_MAGIC
+	pack_into("<5I", header, 8, len(kernel), 0x10008000, 0, 0x11000000, 0)
+	pack_into("<I", header, 36, PAGESIZE)
+	pack_into("<I", header, 40, 2)
+	header[64:77] = b"console=ttyS0"
+
+	data = bytes(header) + kernel.ljust(PAGESIZE, b"\0")
+	if avb_footer:
+		# The footer is at the end of the partition, after some padding
+		data += b"\0" * PAGESIZE
+		data += AVB_FOOTER_MAGIC.ljust(AVB_FOOTER_SIZE, b"\0")
+
+	path.write_bytes(data)
+
+def render_board_config(boot_configuration: BootConfiguration) -> str:
+	"""Render BoardConfig.mk with only the boot configuration, for a device without partitions."""
+	env = jinja_env.overlay(undefined=ChainableUndefined)
+	template = env.get_template("BoardConfig.mk.jinja2")
+
+	return template.render(
+		boot_configuration=boot_configuration,
+		partitions=SimpleNamespace(get_all_partitions=lambda: []),
+		comment_prefix="#",
+	)
+
+class TestBootImage(TestCase):
+	def setUp(self):
+		self.tempdir = TemporaryDirectory()
+		self.path = Path(self.tempdir.name)
+
+	def tearDown(self):
+		self.tempdir.cleanup()
+
+	def test_sigtype(self):
+		make_boot_image(self.path / "boot.img", avb_footer=True)
+		make_boot_image(self.path / "recovery.img", avb_footer=False)
+
+		self.assertEqual(BootImage(self.path / "boot.img").sigtype, "AVBv2")
+		self.assertIsNone(BootImage(self.path / "recovery.img").sigtype)
+
+	def test_board_config_avb(self):
+		make_boot_image(self.path / "boot.img", avb_footer=True)
+		make_boot_image(self.path / "recovery.img", avb_footer=True)
+
+		board_config = render_board_config(BootConfiguration(self.path))
+
+		self.assertIn("BOARD_AVB_ENABLE := true", board_config)
+		self.assertIn("BOARD_AVB_RECOVERY_KEY_PATH", board_config)
+
+	def test_board_config_no_avb(self):
+		make_boot_image(self.path / "boot.img", avb_footer=False)
+
+		board_config = render_board_config(BootConfiguration(self.path))
+
+		self.assertNotIn("BOARD_AVB_ENABLE", board_config)
+
+if __name__ == '__main__':
+	main()